@@ -1,4 +1,4 @@
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { queryOptions, useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import { useNavigate } from "react-router-dom";
 import { client } from "./client";
 import type { components } from "./schema";
@@ -43,35 +43,52 @@ export const useCreateItem = () => {
     }); 
 }
 
+export const itemQueryOptions = (itemId: number) => queryOptions({
+    queryKey: ["items", itemId],
+    queryFn: async () => {
+        const { data, error } = await client.GET("/api/items/{item_id}", {
+            params: { path: { item_id: itemId } }
+        });
+        if (error) throw error;
+        return data;
+    },
+});
+
 export const useGetItem = (itemId: number) => {
     return useQuery({
-        queryKey: ["items", itemId],
-        queryFn: async () => {
-            const { data, error } = await client.GET("/api/items/{item_id}", {
-                params: { path: { item_id: itemId } }
-            });
-            if (error) throw error;
-            return data;
-        },
+        ...itemQueryOptions(itemId),
         enabled: !!itemId,
     });
 };
 
+// PUT /api/items/{item_id} が 409 を返した（読んだ後に他で更新された）
+export class ItemConflictError extends Error {
+    readonly itemId: number;
+
+    constructor(itemId: number) {
+        super("Item was modified by another request");
+        this.name = "ItemConflictError";
+        this.itemId = itemId;
+    }
+}
+
 export const useUpdateItem = () => {
     const queryClient = useQueryClient();
     return useMutation({
         mutationFn: async ({ itemId, data }: {
             itemId: number;
-            data: components["schemas"]["ItemCreateSchema"]
+            data: components["schemas"]["ItemUpdateSchema"]
         }) => {
-            const { data: result, error } = await client.PUT("/api/items/{item_id}", {
+            const { data: result, error, response } = await client.PUT("/api/items/{item_id}", {
                 params: { path: { item_id: itemId } },
                 body: data,
             });
+            if (response.status === 409) throw new ItemConflictError(itemId);
             if (error) throw error;
             return result;
         },
-        onSuccess: () => {
+        // 409 でも一覧のバージョンが古いので再取得する
+        onSettled: () => {
             queryClient.invalidateQueries({ queryKey: ["items"] });
         },
     });
@@ -64,14 +64,21 @@ export interface paths {
         };
         /**
          * List Items
-         * @description List items with pagination support.
+         * @description List items with pagination, filtering and sorting.
          *
          *     Query Parameters:
          *         - limit: Number of items to return (default: 10, max: 100)
          *         - offset: Number of items to skip (default: 0)
+         *         - count_mode: exact (COUNT(*)), cached (TTL cache) or estimated (planner statistics)
+         *         - fields: Only return (and only select) these item fields, e.g. ``id,name``
+         *         - name: Case-insensitive name prefix
+         *         - min_price / max_price: Price range (inclusive)
+         *         - sort: id, price or name, ``-`` for descending (default: ``-id``)
          *
          *     Returns:
-         *         PaginatedItemsResponse with items, count, limit, and offset
+         *         PaginatedItemsResponse with items, count, count_type, limit, and offset.
+         *         With filters, count is the exact number of matching items.
+         *         The ETag covers the page window; a matching If-None-Match returns 304.
          */
         get: operations["items_api_list_items"];
         put?: never;
@@ -83,6 +90,98 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/items/cursor": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * List Items By Cursor
+         * @description List items with keyset (cursor) pagination.
+         *
+         *     Unlike limit/offset, the database never scans skipped rows, so latency
+         *     stays flat however deep the client pages.
+         *
+         *     Query Parameters:
+         *         - limit: Number of items to return (default: 10, max: 100)
+         *         - cursor: next_cursor value from the previous page (omit for the first page)
+         *         - fields: Only return (and only select) these item fields, e.g. ``id,name``
+         *         - name, min_price, max_price, sort: as for ``GET /items``; keep them the same
+         *           for every page of one listing (a cursor is only valid for its sort order)
+         *
+         *     Returns:
+         *         CursorPaginatedItemsResponse with items, limit, and next_cursor
+         */
+        get: operations["items_api_list_items_by_cursor"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/items/bulk": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        /**
+         * Bulk Update
+         * @description Update many items in one request (one SELECT + one conditional UPDATE per batch).
+         *
+         *     Each row carries the version the client read. Unknown or duplicated ids,
+         *     invalid rows and rows whose item has changed since are returned in ``errors``.
+         */
+        put: operations["items_api_bulk_update"];
+        /**
+         * Bulk Create
+         * @description Create many items in one request (single INSERT per batch, one transaction).
+         *
+         *     Rows failing validation are returned in ``errors`` and skipped.
+         */
+        post: operations["items_api_bulk_create"];
+        /**
+         * Bulk Delete
+         * @description Delete many items with one set-based DELETE.
+         *
+         *     Ids that do not exist and repeats of an id already in the request are
+         *     returned in ``errors``.
+         */
+        delete: operations["items_api_bulk_delete"];
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/items/export": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * Export Items
+         * @description Stream the whole item catalog as NDJSON (one JSON object per line) or CSV.
+         *
+         *     Rows are streamed from a server-side cursor, so memory use does not grow
+         *     with the table size.
+         */
+        get: operations["items_api_export_items"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/items/{item_id}": {
         parameters: {
             query?: never;
@@ -92,7 +191,14 @@ export interface paths {
         };
         /** Get Item */
         get: operations["items_api_get_item"];
-        /** Update Item */
+        /**
+         * Update Item
+         * @description Update an item if it is still at the version the client read.
+         *
+         *     One conditional UPDATE (WHERE id=? AND version=?): no prior SELECT and
+         *     no row lock. If another request updated the item first, nothing is
+         *     written and 409 is returned; the client re-reads and retries.
+         */
         put: operations["items_api_update_item"];
         post?: never;
         /** Delete Item */
@@ -119,6 +225,43 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/api/auth/logout": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /** Logout */
+        post: operations["myproject_auth_api_logout"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
+    "/api/test/reset-db": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Reset Db
+         * @description E2Eテスト用: DBをリセットして初期データを投入
+         */
+        post: operations["myproject_test_api_reset_db"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
 }
 export type webhooks = Record<string, never>;
 export interface components {
@@ -167,6 +310,23 @@ export interface components {
              */
             username: string;
         };
+        /**
+         * ItemFilterSchema
+         * @description Query-string filters for the items list.
+         *
+         *     Attributes:
+         *         name: Case-insensitive name prefix
+         *         min_price: Lowest price to include
+         *         max_price: Highest price to include
+         */
+        ItemFilterSchema: {
+            /** Name */
+            name?: string | null;
+            /** Min Price */
+            min_price?: number | null;
+            /** Max Price */
+            max_price?: number | null;
+        };
         /** ItemSchema */
         ItemSchema: {
             /** Id */
@@ -175,6 +335,8 @@ export interface components {
             name: string;
             /** Price */
             price: number;
+            /** Version */
+            version: number;
         };
         /**
          * PaginatedItemsResponse
@@ -183,6 +345,7 @@ export interface components {
          *     Attributes:
          *         items: List of items for the current page
          *         count: Total number of items across all pages
+         *         count_type: How count was obtained (exact, cached, or estimated)
          *         limit: Number of items per page (requested)
          *         offset: Starting position for this page
          */
@@ -191,6 +354,12 @@ export interface components {
             items: components["schemas"]["ItemSchema"][];
             /** Count */
             count: number;
+            /**
+             * Count Type
+             * @default exact
+             * @enum {string}
+             */
+            count_type: "exact" | "cached" | "estimated";
             /** Limit */
             limit: number;
             /** Offset */
@@ -203,6 +372,95 @@ export interface components {
             /** Price */
             price: number;
         };
+        /**
+         * CursorPaginatedItemsResponse
+         * @description Keyset (cursor) paginated response for items list.
+         *
+         *     Attributes:
+         *         items: List of items for the current page
+         *         limit: Number of items per page (requested)
+         *         next_cursor: Opaque cursor for the next page, null on the last page
+         */
+        CursorPaginatedItemsResponse: {
+            /** Items */
+            items: components["schemas"]["ItemSchema"][];
+            /** Limit */
+            limit: number;
+            /** Next Cursor */
+            next_cursor?: string | null;
+        };
+        /**
+         * BulkItemsResponse
+         * @description Response for bulk create/update.
+         *
+         *     Attributes:
+         *         items: Rows that were written
+         *         errors: Rows that were skipped, with the reason
+         */
+        BulkItemsResponse: {
+            /** Items */
+            items: components["schemas"]["ItemSchema"][];
+            /** Errors */
+            errors: components["schemas"]["BulkRowError"][];
+        };
+        /**
+         * BulkRowError
+         * @description Error for a single row of a bulk request.
+         *
+         *     Attributes:
+         *         index: Position of the row in the request body
+         *         id: Item id the row refers to (updates and deletes only)
+         *         errors: Field name -> error messages
+         */
+        BulkRowError: {
+            /** Index */
+            index: number;
+            /** Id */
+            id?: number | null;
+            /** Errors */
+            errors: {
+                [key: string]: string[];
+            };
+        };
+        /** ItemBulkUpdateSchema */
+        ItemBulkUpdateSchema: {
+            /** Name */
+            name: string;
+            /** Price */
+            price: number;
+            /** Version */
+            version: number;
+            /** Id */
+            id: number;
+        };
+        /** BulkDeleteResponse */
+        BulkDeleteResponse: {
+            /** Deleted */
+            deleted: number;
+            /** Errors */
+            errors: components["schemas"]["BulkRowError"][];
+        };
+        /** ItemBulkDeleteSchema */
+        ItemBulkDeleteSchema: {
+            /** Ids */
+            ids: number[];
+        };
+        /**
+         * ItemUpdateSchema
+         * @description Body of PUT /items/{id}.
+         *
+         *     Attributes:
+         *         version: The version the client last read; the update is rejected
+         *             with 409 if the item has been changed since
+         */
+        ItemUpdateSchema: {
+            /** Name */
+            name: string;
+            /** Price */
+            price: number;
+            /** Version */
+            version: number;
+        };
         /** LoginInput */
         LoginInput: {
             /** Username */
@@ -210,6 +468,13 @@ export interface components {
             /** Password */
             password: string;
         };
+        /** ResetDbResponse */
+        ResetDbResponse: {
+            /** Success */
+            success: boolean;
+            /** Message */
+            message: string;
+        };
     };
     responses: never;
     parameters: never;
@@ -298,6 +563,15 @@ export interface operations {
                 limit?: number;
                 /** @description Starting position for pagination */
                 offset?: number;
+                /** @description How the total count is computed */
+                count_mode?: "exact" | "cached" | "estimated";
+                /** @description Comma-separated item fields to return, e.g. id,name */
+                fields?: string | null;
+                name?: string | null;
+                min_price?: number | null;
+                max_price?: number | null;
+                /** @description Sort order; only index-backed orders are accepted */
+                sort?: "-id" | "id" | "price" | "-price" | "name" | "-name";
             };
             header?: never;
             path?: never;
@@ -340,10 +614,138 @@ export interface operations {
             };
         };
     };
-    items_api_get_item: {
+    items_api_list_items_by_cursor: {
+        parameters: {
+            query?: {
+                /** @description Number of items per page */
+                limit?: number;
+                /** @description Opaque cursor from a previous next_cursor */
+                cursor?: string | null;
+                /** @description Comma-separated item fields to return, e.g. id,name */
+                fields?: string | null;
+                name?: string | null;
+                min_price?: number | null;
+                max_price?: number | null;
+                /** @description Sort order; only index-backed orders are accepted */
+                sort?: "-id" | "id" | "price" | "-price" | "name" | "-name";
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description OK */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["CursorPaginatedItemsResponse"];
+                };
+            };
+        };
+    };
+    items_api_bulk_update: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["ItemBulkUpdateSchema"][];
+            };
+        };
+        responses: {
+            /** @description OK */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["BulkItemsResponse"];
+                };
+            };
+        };
+    };
+    items_api_bulk_create: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["ItemCreateSchema"][];
+            };
+        };
+        responses: {
+            /** @description OK */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["BulkItemsResponse"];
+                };
+            };
+        };
+    };
+    items_api_bulk_delete: {
         parameters: {
             query?: never;
             header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["ItemBulkDeleteSchema"];
+            };
+        };
+        responses: {
+            /** @description OK */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["BulkDeleteResponse"];
+                };
+            };
+        };
+    };
+    items_api_export_items: {
+        parameters: {
+            query?: {
+                /** @description ndjson or csv */
+                format?: "ndjson" | "csv";
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description OK */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+        };
+    };
+    items_api_get_item: {
+        parameters: {
+            query?: {
+                /** @description Comma-separated item fields to return, e.g. id,name */
+                fields?: string | null;
+            };
+            header?: never;
             path: {
                 item_id: number;
             };
@@ -373,7 +775,7 @@ export interface operations {
         };
         requestBody: {
             content: {
-                "application/json": components["schemas"]["ItemCreateSchema"];
+                "application/json": components["schemas"]["ItemUpdateSchema"];
             };
         };
         responses: {
@@ -430,4 +832,42 @@ export interface operations {
             };
         };
     };
+    myproject_auth_api_logout: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description OK */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+        };
+    };
+    myproject_test_api_reset_db: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description OK */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["ResetDbResponse"];
+                };
+            };
+        };
+    };
 }
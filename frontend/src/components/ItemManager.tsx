@@ -1,5 +1,9 @@
 import { useState } from 'react'
-import { useGetItems, useCreateItem, useUpdateItem, useDeleteItem, useLogout } from '../api/hooks'
+import { useQueryClient } from '@tanstack/react-query'
+import {
+  useGetItems, useCreateItem, useUpdateItem, useDeleteItem, useLogout,
+  itemQueryOptions, ItemConflictError,
+} from '../api/hooks'
 import { ItemList } from './ItemList'
 import type { components } from '../api/schema'
 
@@ -19,6 +23,8 @@ function ItemManager() {
 
   // 編集状態
   const [editingItem, setEditingItem] = useState<ItemSchema | null>(null)
+  // 更新の競合などユーザーへの通知
+  const [notice, setNotice] = useState<string | null>(null)
 
   // TanStack Query フック（ページネーション対応）
   const { data, isLoading, error } = useGetItems({
@@ -29,6 +35,7 @@ function ItemManager() {
   const updateItem = useUpdateItem()
   const deleteItem = useDeleteItem()
   const logout = useLogout()
+  const queryClient = useQueryClient()
 
   // 編集開始
   const handleEdit = (item: ItemSchema) => {
@@ -42,22 +49,45 @@ function ItemManager() {
     setEditingItem(null)
     setNewName('')
     setNewPrice('')
+    setNotice(null)
+  }
+
+  // 409: 他で更新済みなので最新の内容を読み直し、確認してから再送してもらう
+  const handleConflict = async (itemId: number) => {
+    const latest = await queryClient
+      .fetchQuery({ ...itemQueryOptions(itemId), staleTime: 0 })
+      .catch(() => undefined)
+    if (latest) {
+      handleEdit(latest)
+      setNotice('この商品は他で更新されていました。最新の内容を読み込んだので、確認してからもう一度更新してください。')
+    } else {
+      handleCancelEdit()
+      setNotice('この商品は他で削除されていました。')
+    }
   }
 
   // 新規作成 or 更新
   const handleSubmit = (e: React.FormEvent) => {
     e.preventDefault()
     if (!newName || !newPrice) return
+    setNotice(null)
 
     if (editingItem) {
       updateItem.mutate(
-        { itemId: editingItem.id, data: { name: newName, price: Number(newPrice) } },
+        {
+          itemId: editingItem.id,
+          // 編集開始時に読んだバージョン（他で更新済みなら 409 になる）
+          data: { name: newName, price: Number(newPrice), version: editingItem.version },
+        },
         {
           onSuccess: () => {
             setEditingItem(null)
             setNewName('')
             setNewPrice('')
-          }
+          },
+          onError: (err) => {
+            if (err instanceof ItemConflictError) handleConflict(err.itemId)
+          },
         }
       )
     } else {
@@ -135,6 +165,7 @@ function ItemManager() {
           </button>
         )}
       </form>
+      {notice && <p role="alert">{notice}</p>}
 
       {/* 一覧表示（ItemListコンポーネント使用） */}
       <ItemList
@@ -0,0 +1,81 @@
+"""
+Benchmark: throughput and latency of ``GET /api/items`` against a running server.
+
+Logs in once (the access token is kept as a cookie) and then keeps
+``--concurrency`` requests in flight for ``--duration`` seconds.
+
+Compare the development server with the production server at different
+worker counts, e.g.:
+
+    uv run python manage.py runserver 8000 --noreload
+    WEB_CONCURRENCY=1 uv run gunicorn myproject.asgi:application -c gunicorn.conf.py
+    WEB_CONCURRENCY=4 uv run gunicorn myproject.asgi:application -c gunicorn.conf.py
+
+    uv run python benchmarks/bench_api_throughput.py --username admin --password ...
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def worker(client: httpx.AsyncClient, path: str, deadline: float, latencies, errors):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get(path)
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors.append(response.status_code)
+
+
+async def run(args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        response = await client.post(
+            "/api/auth/login", json={"username": args.username, "password": args.password}
+        )
+        response.raise_for_status()
+
+        # ウォームアップ（接続確立・キャッシュの初期化を計測から外す）
+        for _ in range(args.concurrency):
+            await client.get(args.path)
+
+        latencies: list = []
+        errors: list = []
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                worker(client, args.path, deadline, latencies, errors)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print(f"no successful requests (errors: {errors[:5]})")
+        return
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"requests:   {len(latencies)} ok, {len(errors)} failed in {elapsed:.1f}s")
+    print(f"throughput: {len(latencies) / elapsed:.0f} req/s")
+    print(f"latency:    p50 {statistics.median(latencies) * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", default="/api/items?limit=20")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: cold-start import time of the Django project.
+
+Runs ``python -X importtime`` on what every worker, ``manage.py`` command
+and test run does at startup (``django.setup()`` and loading the URLconf),
+then reports the total import time, the slowest top-level packages and the
+peak memory of that process.
+
+It also acts as a guard: the command exits with status 1 if a module that
+must be imported lazily (``todoapp.rendering.LAZY_MODULES``) was
+loaded at startup, or if the total exceeds ``--max-ms``.
+
+    uv run python benchmarks/bench_import_time.py
+    uv run python benchmarks/bench_import_time.py --runs 5 --max-ms 1500
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+STARTUP = """
+import resource
+import django
+
+django.setup()
+import myproject.urls
+
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+# "import time:       self [us] |  cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure():
+    """Run one cold start; returns (per-top-level-package µs, max RSS KiB)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP],
+        cwd=BASE_DIR,
+        env={"DJANGO_SETTINGS_MODULE": "myproject.settings", **os.environ},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    packages = defaultdict(int)
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, _, _, module = match.groups()
+        # self の時間をトップレベルのパッケージごとに合計する（cumulative は入れ子で重複する）
+        packages[module.split(".")[0]] += int(self_us)
+    return packages, int(result.stdout.split()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=3, help="report the fastest of N runs")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail above this total")
+    args = parser.parse_args()
+
+    # rendering は Django に依存しないので、django.setup() なしで読める
+    sys.path.insert(0, str(BASE_DIR))
+    from todoapp.rendering import LAZY_MODULES
+
+    runs = [measure() for _ in range(args.runs)]
+    packages, max_rss = min(runs, key=lambda run: sum(run[0].values()))
+    total_ms = sum(packages.values()) / 1000
+
+    print(f"total import time: {total_ms:.0f} ms (fastest of {args.runs})")
+    print(f"peak memory:       {max_rss / 1024:.0f} MiB")
+    print(f"\n{'package':<24} {'ms':>8}")
+    for name, micros in sorted(packages.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{name:<24} {micros / 1000:>8.1f}")
+
+    failures = [f"{name} is imported at startup" for name in LAZY_MODULES if name in packages]
+    if args.max_ms is not None and total_ms > args.max_ms:
+        failures.append(f"total import time {total_ms:.0f} ms exceeds {args.max_ms:.0f} ms")
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: JSON rendering and parsing of the items API, orjson vs stdlib.
+
+Renders the same payloads Ninja passes to the renderer (the response
+schema's ``model_dump()``) with both ``FastJSONRenderer`` backends:
+
+- ``list``:   a ``PaginatedItemsResponse`` page with ``--items`` items
+- ``detail``: a single ``ItemSchema``
+- ``parse``:  a 100-row bulk update request body, through ``FastJSONParser``
+
+No database is needed; the items are built in memory.
+
+    uv run python benchmarks/bench_json_renderer.py --items 100
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django() -> None:
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "myproject.settings")
+
+    import django
+
+    django.setup()
+
+
+def best_of(func, number: int, repeat: int = 5) -> float:
+    """Fastest time per call in µs."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing run")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from items.models import Item
+    from items.schemas import ItemSchema, PaginatedItemsResponse
+    from myproject.fast_json import BACKENDS, FastJSONParser, FastJSONRenderer, orjson
+
+    items = [Item(id=i, name=f"商品 {i}", price=100 + i, version=1) for i in range(args.items)]
+    payloads = {
+        "list": PaginatedItemsResponse.model_validate(
+            {"items": items, "count": 10_000, "count_type": "exact", "limit": 100, "offset": 0}
+        ).model_dump(),
+        "detail": ItemSchema.model_validate(items[0]).model_dump(),
+    }
+    body = (
+        FastJSONRenderer("stdlib")
+        .render(
+            None,
+            [{"id": i, "name": f"商品 {i}", "price": 100 + i} for i in range(100)],
+            response_status=200,
+        )
+        .encode()
+    )
+    request = SimpleNamespace(body=body)
+
+    backends = [backend for backend in BACKENDS if backend != "orjson" or orjson is not None]
+    if orjson is None:
+        print("orjson is not installed: only the stdlib backend is measured.\n")
+
+    results = {}
+    for backend in backends:
+        renderer = FastJSONRenderer(backend)
+        for name, data in payloads.items():
+            results[name, backend] = best_of(
+                lambda: renderer.render(None, data, response_status=200), args.number
+            )
+        json_parser = FastJSONParser(backend)
+        results["parse", backend] = best_of(lambda: json_parser.parse_body(request), args.number)
+
+    print(f"{'payload':<8} " + " ".join(f"{backend + ' µs':>12}" for backend in backends), end="")
+    print(f" {'speedup':>8}" if len(backends) > 1 else "")
+    for name in ("list", "detail", "parse"):
+        row = [results[name, backend] for backend in backends]
+        print(f"{name:<8} " + " ".join(f"{micros:>12.1f}" for micros in row), end="")
+        print(f" {row[1] / row[0]:>7.1f}x" if len(row) > 1 else "")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from myproject.response_cache import bump_version
+
 from .models import Book
 
 
@@ -8,6 +10,15 @@ class BookAdmin(admin.ModelAdmin):
     search_fields = ("title", "author")
     list_filter = ("publication_date",)
 
+    # 削除シグナルは受けていないため、管理画面からの削除でもキャッシュを無効化する
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        bump_version("books")
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        bump_version("books")
+
 
 admin.site.register(Book, BookAdmin)
 
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class BookappConfig(AppConfig):
     name = "bookapp"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from myproject.response_cache import bump_version
+
+from .models import Book
+
+
+# post_delete は受けない: 受信側があると Django は削除を高速経路（DELETE 1回）で実行できず、
+# 対象行の SELECT + 行ごとのシグナルになる。削除する側（views.py / admin.py）で無効化する
+@receiver(post_save, sender=Book)
+def invalidate_books_cache(sender, **kwargs):
+    """Book の作成・更新でキャッシュ済みのページを破棄する"""
+    bump_version("books")
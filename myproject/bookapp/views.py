@@ -3,18 +3,22 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.shortcuts import get_object_or_404, redirect, render
 
+from myproject.response_cache import bump_version, cache_view
+
 from .forms import BookForm
 from .models import Book
 
 
 # Create your views here.
 @login_required
+@cache_view("books")
 def book_list(request):
     books = Book.objects.all()
     return render(request, "bookapp/book_list.html", {"book_list": books})
 
 
 @login_required
+@cache_view("books")
 def book_detail(request, pk):
     target = get_object_or_404(Book, pk=pk)
     return render(request, "bookapp/book_detail.html", {"book": target})
@@ -59,7 +63,9 @@ def book_delete(request, pk):
     target = get_object_or_404(Book, pk=pk)
     if request.method == "POST":
         cover_image_delete(target)
-        target.delete()
+        # DELETE 1回で削除し（削除シグナルは受けていない）、キャッシュはここで無効化する
+        Book.objects.filter(pk=target.pk).delete()
+        bump_version("books")
         messages.success(request, "書籍が正常に削除されました。")
         return redirect("book_list")
     return render(request, "bookapp/book_confirm_delete.html", {"book": target})
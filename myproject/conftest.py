@@ -1,11 +1,30 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from ninja.testing import TestAsyncClient
 from ninja_jwt.tokens import RefreshToken
 
+from myproject.query_budget import assert_query_budget
+from myproject.token_cache import verified_tokens
 from myproject.urls import api
 
 
+@pytest.fixture(autouse=True)
+def clear_verified_tokens():
+    """検証済みトークンのキャッシュはプロセス全体で共有されるため、テストごとに空にする"""
+    verified_tokens.clear()
+    yield
+    verified_tokens.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """キャッシュ（レスポンス・件数など）はDBと違いテストごとに戻らないため、毎回空にする"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def user(db):
     return User.objects.create_user(
@@ -24,3 +43,14 @@ def auth_headers(user):
 async def async_client():
     client = TestAsyncClient(api)
     yield client
+
+
+@pytest.fixture
+def query_budget():
+    """
+    クエリ数の上限を検証するコンテキストマネージャを返す
+
+        with query_budget(3): ...
+        async with query_budget(2, max_duplicates=0): ...
+    """
+    return assert_query_budget
@@ -4,4 +4,16 @@ set -e
 echo "Running migrations..."
 uv run python manage.py migrate --noinput
 
-exec "$@"
+# コマンドが指定されていればそれを実行（例: docker compose run backend uv run pytest）
+if [ "$#" -gt 0 ]; then
+    exec "$@"
+fi
+
+# DJANGO_ENV でサーバーを切り替える
+if [ "$DJANGO_ENV" = "production" ]; then
+    echo "Starting gunicorn (uvicorn workers)..."
+    exec uv run gunicorn myproject.asgi:application -c gunicorn.conf.py
+else
+    echo "Starting development server..."
+    exec uv run python manage.py runserver 0.0.0.0:8000
+fi
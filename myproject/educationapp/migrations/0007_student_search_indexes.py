@@ -0,0 +1,49 @@
+from django.db import migrations, models
+
+# 名前検索用インデックスはDBごとに定義が異なるため、SQLで作成する
+# - PostgreSQL: name__icontains は UPPER(name) LIKE UPPER('%x%') になるので、
+#   UPPER(name) に対する pg_trgm の GIN インデックスで部分一致を高速化する
+# - SQLite: 前方一致 (LIKE 'x%') は NOCASE 照合のインデックスでしか最適化されない
+NAME_SEARCH_INDEXES = {
+    "postgresql": (
+        [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            "CREATE INDEX IF NOT EXISTS student_name_trgm_idx "
+            "ON educationapp_student USING gin (UPPER(name) gin_trgm_ops)",
+        ],
+        ["DROP INDEX IF EXISTS student_name_trgm_idx"],
+    ),
+    "sqlite": (
+        [
+            "CREATE INDEX IF NOT EXISTS student_name_nocase_idx "
+            "ON educationapp_student (name COLLATE NOCASE)",
+        ],
+        ["DROP INDEX IF EXISTS student_name_nocase_idx"],
+    ),
+}
+
+
+def create_name_search_index(apps, schema_editor):
+    forwards, _ = NAME_SEARCH_INDEXES.get(schema_editor.connection.vendor, ([], []))
+    for sql in forwards:
+        schema_editor.execute(sql)
+
+
+def drop_name_search_index(apps, schema_editor):
+    _, backwards = NAME_SEARCH_INDEXES.get(schema_editor.connection.vendor, ([], []))
+    for sql in backwards:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("educationapp", "0006_rename_strat_date_course_start_date"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(fields=["age", "id"], name="student_age_id_idx"),
+        ),
+        migrations.RunPython(create_name_search_index, drop_name_search_index),
+    ]
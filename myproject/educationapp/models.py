@@ -30,6 +30,14 @@ class Student(models.Model):
         blank=True,
     )
 
+    class Meta:
+        indexes = [
+            # 年齢の lt/gt/eq 絞り込み + id 順のページングを支える複合インデックス
+            models.Index(fields=["age", "id"], name="student_age_id_idx"),
+        ]
+        # 名前検索用のインデックス（PostgreSQL: pg_trgm GIN / SQLite: NOCASE）は
+        # DBごとに定義が異なるため、マイグレーション 0007 の RunPython で作成する
+
 
 class Profile(models.Model):
     student = models.OneToOneField(Student, on_delete=models.CASCADE)
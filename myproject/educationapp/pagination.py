@@ -0,0 +1,29 @@
+"""
+id によるキーセット(カーソル)ページング
+
+OFFSET を使わず「前のページの最後の id より後」を取得するため、
+何ページ目でも id のインデックスを使った同じコストで取得できる。
+"""
+
+PAGE_SIZE = 50
+
+
+def keyset_page(queryset, after=None, page_size=PAGE_SIZE):
+    """
+    id 昇順で after より後の page_size 件を返す
+
+    戻り値は (そのページの行のリスト, 次のページの after の値 or None)。
+    after が数値でない場合は最初のページを返す。
+    """
+    queryset = queryset.order_by("id")
+    try:
+        queryset = queryset.filter(id__gt=int(after))
+    except (TypeError, ValueError):
+        pass
+
+    # 1件多く取得して、次のページがあるかどうかを判定する
+    rows = list(queryset[: page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, rows[-1].id
@@ -0,0 +1,34 @@
+"""
+生徒の名前検索バックエンド
+
+DBごとに、インデックスで処理できる検索方法を選ぶ（0007 のマイグレーション参照）。
+- PostgreSQL: 部分一致 (icontains)。pg_trgm の GIN インデックスを使う
+- それ以外 (SQLite): 前方一致 (istartswith)。NOCASE のインデックスを使う
+"""
+
+from django.db import connections
+
+# 年齢条件 (age_operator) とフィルターの対応
+AGE_LOOKUPS = {
+    "lt": "age__lt",
+    "gt": "age__gt",
+    "eq": "age",
+}
+
+
+def filter_by_name(students, name):
+    if connections[students.db].vendor == "postgresql":
+        return students.filter(name__icontains=name)
+    return students.filter(name__istartswith=name)
+
+
+def filter_by_age(students, age, operator):
+    """age が数値でない、または operator が不明な場合は絞り込まない"""
+    lookup = AGE_LOOKUPS.get(operator)
+    if lookup is None:
+        return students
+    try:
+        age_value = int(age)
+    except (TypeError, ValueError):
+        return students
+    return students.filter(**{lookup: age_value})
@@ -1 +1,138 @@
-# Create your tests here.
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import TestCase
+from django.urls import reverse
+
+from myproject.query_budget import assert_query_budget
+
+from .models import Course, SchoolClass, Student
+from .pagination import PAGE_SIZE, keyset_page
+from .search import filter_by_name
+
+
+def create_students(names_and_ages):
+    school_class = SchoolClass.objects.create(name="1-A")
+    return Student.objects.bulk_create(
+        Student(
+            name=name,
+            age=age,
+            enrollment_date=date(2026, 4, 1),
+            class_assignment=school_class,
+        )
+        for name, age in names_and_ages
+    )
+
+
+class StudentSearchTests(TestCase):
+    def setUp(self):
+        create_students([("Alice", 10), ("alex", 12), ("Bob", 12), ("Carol", 15)])
+
+    def names(self, **params):
+        response = self.client.get(reverse("students_where"), params)
+        self.assertEqual(response.status_code, 200)
+        return [student.name for student in response.context["students"]]
+
+    def test_name_search_is_case_insensitive(self):
+        self.assertEqual(self.names(name="AL"), ["Alice", "alex"])
+
+    def test_age_operators(self):
+        self.assertEqual(self.names(age=12, age_operator="lt"), ["Alice"])
+        self.assertEqual(self.names(age=12, age_operator="eq"), ["alex", "Bob"])
+        self.assertEqual(self.names(age=12, age_operator="gt"), ["Carol"])
+
+    def test_invalid_age_is_ignored(self):
+        self.assertEqual(len(self.names(age="abc", age_operator="lt")), 4)
+
+    def test_name_search_uses_index(self):
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                # 件数が少ないと seq scan の方が安く見積もられるため、インデックスが使えるかを見る
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = filter_by_name(Student.objects.all(), "ali").explain()
+        if connection.vendor == "postgresql":
+            self.assertNotIn("Seq Scan", plan)
+            self.assertIn("student_name_trgm_idx", plan)
+        else:
+            self.assertIn("student_name_nocase_idx", plan)
+
+
+class StudentKeysetPaginationTests(TestCase):
+    def setUp(self):
+        create_students([(f"Student {i:02d}", 10 + i % 5) for i in range(25)])
+
+    def test_pages_cover_all_rows_once(self):
+        seen = []
+        after = None
+        while True:
+            page, after = keyset_page(Student.objects.all(), after, page_size=10)
+            seen.extend(student.name for student in page)
+            if after is None:
+                break
+        self.assertEqual(seen, [f"Student {i:02d}" for i in range(25)])
+
+    def test_view_without_next_page(self):
+        response = self.client.get(reverse("students_where"), {"name": "student"})
+        self.assertEqual(len(response.context["students"]), 25)
+        self.assertIsNone(response.context["next_after"])
+
+
+class StudentListingTests(TestCase):
+    def setUp(self):
+        students = create_students([(f"Student {i:02d}", 10) for i in range(60)])
+        courses = [
+            Course.objects.create(
+                title=f"Course {i}",
+                description="x" * 1000,
+                start_date=date(2026, 4, 1),
+                end_date=date(2027, 3, 31),
+            )
+            for i in range(3)
+        ]
+        for student in students:
+            student.courses.set(courses)
+
+    def test_student_list_is_paginated(self):
+        response = self.client.get(reverse("student_list"))
+        self.assertEqual(len(response.context["students"]), PAGE_SIZE)
+
+        response = self.client.get(
+            reverse("student_list"), {"after": response.context["next_after"]}
+        )
+        self.assertEqual(len(response.context["students"]), 60 - PAGE_SIZE)
+        self.assertIsNone(response.context["next_after"])
+
+    def test_students_with_courses_prefetches_one_page(self):
+        # 生徒1ページ分 + そのページのコース、の2クエリで済む
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("students_join_table_courses"))
+        students = response.context["students"]
+        self.assertEqual(len(students), PAGE_SIZE)
+        self.assertEqual(len(students[0].courses.all()), 3)
+        # コースは title だけを読み込んでいる
+        self.assertEqual(
+            students[0].courses.all()[0].get_deferred_fields(),
+            {"description", "start_date", "end_date"},
+        )
+
+
+class StudentQueryBudgetTests(TestCase):
+    """一覧系のビューが生徒数に比例してクエリを発行しない（N+1 にならない）こと"""
+
+    def setUp(self):
+        create_students([(f"Student {i:02d}", 10) for i in range(10)])
+
+    def assert_within_budget(self, route, params=None):
+        budget = settings.QUERY_BUDGET["ROUTES"][route]
+        with assert_query_budget(budget, max_duplicates=0):
+            response = self.client.get(reverse(route), params)
+        self.assertEqual(response.status_code, 200)
+
+    def test_class_students(self):
+        school_class = SchoolClass.objects.get()
+        self.assert_within_budget("students_by_class", {"class_id": school_class.id})
+
+    def test_student_with_profile_list(self):
+        self.assert_within_budget("students_join_profile")
@@ -1,13 +1,20 @@
+from django.db.models import Prefetch, prefetch_related_objects
 from django.shortcuts import get_object_or_404, render
 
-from .models import SchoolClass, Student
+from .models import Course, SchoolClass, Student
+from .pagination import keyset_page
+from .search import filter_by_age, filter_by_name
 
 
 def get_all_student(request):
-    # studentテーブルの全てのデータを取得
-    students = Student.objects.all()
+    # studentテーブルのデータを id 順に1ページ分だけ取得（?after=<前ページ最後のid>）
+    students, next_after = keyset_page(Student.objects.all(), request.GET.get("after"))
     #'educationapp/student_list.html'というテンプレートを使用して、studentsをcontextとして渡す
-    return render(request, "educationapp/student_list.html", {"students": students})
+    return render(
+        request,
+        "educationapp/student_list.html",
+        {"students": students, "next_after": next_after},
+    )
 
 
 def get_student_by_id(request, id):
@@ -20,24 +27,18 @@ def filter_students(request):
     name_query = request.GET.get("name")
 
     if name_query:
-        students = students.filter(name__icontains=name_query)
+        students = filter_by_name(students, name_query)
 
-    age_query = request.GET.get("age")
-    age_operator = request.GET.get("age_operator")
+    students = filter_by_age(students, request.GET.get("age"), request.GET.get("age_operator"))
 
-    if age_query and age_operator:
-        try:
-            age_value = int(age_query)
-            if age_operator == "lt":
-                students = students.filter(age__lt=age_value)
-            elif age_operator == "gt":
-                students = students.filter(age__gt=age_value)
-            elif age_operator == "eq":
-                students = students.filter(age=age_value)
-        except ValueError:
-            pass
+    # 結果は id 順に1ページずつ返す（?after=<前ページ最後のid>）
+    page, next_after = keyset_page(students, request.GET.get("after"))
 
-    return render(request, "educationapp/student_list.html", {"students": students})
+    return render(
+        request,
+        "educationapp/student_list.html",
+        {"students": page, "next_after": next_after},
+    )
 
 
 def student_with_profile_list(request):
@@ -74,6 +75,15 @@ def class_students(request):
 
 
 def students_with_courses(request):
-    students = Student.objects.prefetch_related("courses")
+    students, next_after = keyset_page(Student.objects.all(), request.GET.get("after"))
+
+    # 表示するページの生徒の分だけ、コース名(title)のみをまとめて取得する
+    prefetch_related_objects(
+        students, Prefetch("courses", queryset=Course.objects.only("title").order_by("id"))
+    )
 
-    return render(request, "educationapp/student_list_with_courses.html", {"students": students})
+    return render(
+        request,
+        "educationapp/student_list_with_courses.html",
+        {"students": students, "next_after": next_after},
+    )
@@ -0,0 +1,35 @@
+"""
+本番用 ASGI サーバー設定（gunicorn + uvicorn ワーカー）
+
+    uv run gunicorn myproject.asgi:application -c gunicorn.conf.py
+
+- gunicorn がワーカープロセスを管理し（落ちたら再起動、HUP でグレースフルリロード）、
+  各ワーカーは uvicorn のイベントループで myproject.asgi:application を動かす
+- ワーカー数は既定でコンテナに割り当てられた CPU 数（WEB_CONCURRENCY で上書き可）
+- 各ワーカーは MAX_REQUESTS (+ ジッター) 件処理したら作り直され、メモリの増加を防ぐ
+"""
+
+import os
+
+# ---- Server socket ----
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# ---- Workers ----
+# API はすべて async def なので、1ワーカー = 1イベントループで CPU 1つを使い切る想定
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY", str(os.process_cpu_count() or 1)))
+
+# ---- Worker recycling / graceful restart ----
+# 全ワーカーが同時に再起動しないよう、ジッターで件数をずらす
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+# 再起動・停止時に処理中のリクエストを待つ秒数
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# 応答のないワーカーを強制終了するまでの秒数
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+
+# ---- Logging ----
+accesslog = "-"
+errorlog = "-"
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
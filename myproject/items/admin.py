@@ -1,5 +1,18 @@
 from django.contrib import admin
 
 from .models import Item
+from .signals import invalidate_item_caches
 
-admin.site.register(Item)
+
+class ItemAdmin(admin.ModelAdmin):
+    # 削除シグナルは受けていないため、管理画面からの削除でもキャッシュを無効化する
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_item_caches(sender=Item)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_item_caches(sender=Item)
+
+
+admin.site.register(Item, ItemAdmin)
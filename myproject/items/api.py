@@ -1,50 +1,244 @@
-from typing import List
+from typing import List, Optional
 
+from django.db.models import F
+from django.http import Http404, HttpResponse
 from django.shortcuts import aget_object_or_404
-from ninja import Router, Query
+from django.utils import timezone
+from ninja import Query, Router
+from ninja.errors import HttpError
 
 from myproject.custom_auth import AsyncJWTAuthWithCookie
+from myproject.response_cache import abump_version, cache_response
+from myproject.sparse_fields import InvalidFields, parse_fields, partial_schema
+from myproject.values_rows import afetch_rows, render_json, schema_fields, split_extra
 
+from .bulk import BULK_MAX_ROWS, bulk_create_items, bulk_delete_items, bulk_update_items
+from .counting import CountType, count_items
+from .etags import item_etag, not_modified, page_etag, rows_fingerprint, window_fingerprint
+from .export import ExportFormat, export_response
+from .filters import ITEM_ORDERINGS, ItemFilterSchema, ItemSort
 from .models import Item
-from .schemas import ItemCreateSchema, ItemSchema, PaginatedItemsResponse
+from .pagination import InvalidCursor, paginate_keyset
+from .schemas import (
+    BulkDeleteResponse,
+    BulkItemsResponse,
+    CursorPaginatedItemsResponse,
+    ItemBulkDeleteSchema,
+    ItemBulkUpdateSchema,
+    ItemCreateSchema,
+    ItemSchema,
+    ItemUpdateSchema,
+    PaginatedItemsResponse,
+)
+from .signals import ainvalidate_item_caches
 
 router = Router()
 
+# 一覧は先頭のページだけキャッシュする（深いページまで保持してもほぼ再利用されない）
+LIST_CACHE_MAX_OFFSET = 100
+
+
+# ページの ETag に使う列（fields= で指定されていなくても取得する）
+ETAG_COLUMNS = ("id", "updated")
+
+FIELDS_QUERY = Query(None, description="Comma-separated item fields to return, e.g. id,name")
+
+SORT_QUERY = Query("-id", description="Sort order; only index-backed orders are accepted")
+
+
+def _is_first_pages(request, offset: int = 0, **kwargs) -> bool:
+    return offset < LIST_CACHE_MAX_OFFSET
+
+
+def _item_schema(fields: Optional[str]):
+    """ItemSchema narrowed to the ``fields=`` parameter (all fields when omitted)"""
+    try:
+        selected = parse_fields(fields, ItemSchema)
+    except InvalidFields as e:
+        raise HttpError(400, str(e))
+    return ItemSchema if selected is None else partial_schema(ItemSchema, selected)
+
 
 @router.get("", response=PaginatedItemsResponse, auth=AsyncJWTAuthWithCookie())
+@cache_response("items", condition=_is_first_pages)
 async def list_items(
     request,
+    response: HttpResponse,
     limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
-    offset: int = Query(0, ge=0, description="Starting position for pagination")
+    offset: int = Query(0, ge=0, description="Starting position for pagination"),
+    count_mode: CountType = Query("exact", description="How the total count is computed"),
+    fields: Optional[str] = FIELDS_QUERY,
+    filters: ItemFilterSchema = Query(...),
+    sort: ItemSort = SORT_QUERY,
 ):
     """
-    List items with pagination support.
+    List items with pagination, filtering and sorting.
 
     Query Parameters:
         - limit: Number of items to return (default: 10, max: 100)
         - offset: Number of items to skip (default: 0)
+        - count_mode: exact (COUNT(*)), cached (TTL cache) or estimated (planner statistics)
+        - fields: Only return (and only select) these item fields, e.g. ``id,name``
+        - name: Case-insensitive name prefix
+        - min_price / max_price: Price range (inclusive)
+        - sort: id, price or name, ``-`` for descending (default: ``-id``)
 
     Returns:
-        PaginatedItemsResponse with items, count, limit, and offset
+        PaginatedItemsResponse with items, count, count_type, limit, and offset.
+        With filters, count is the exact number of matching items.
+        The ETag covers the page window; a matching If-None-Match returns 304.
     """
+    schema = _item_schema(fields)
+    where = filters.get_filter_expression()
+
     # Get total count (native async - Django 6.0+)
-    total_count = await Item.objects.acount()
+    total_count, count_type = await count_items(count_mode, where)
+
+    window = Item.objects.filter(where).order_by(*ITEM_ORDERINGS[sort])[offset : offset + limit]
+
+    # Revalidation: compare the page fingerprint before loading or serializing the rows
+    if "If-None-Match" in request.headers:
+        etag = page_etag(request, total_count, await window_fingerprint(window))
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+    # Get paginated items as ItemSchema-shaped dicts (no model instances, no re-validation)
+    rows = await afetch_rows(window, schema, extra=ETAG_COLUMNS)
+    etag_columns = split_extra(rows, schema, ETAG_COLUMNS)
+    fingerprint = rows_fingerprint(etag_columns["id"], etag_columns["updated"])
+    response["ETag"] = page_etag(request, total_count, fingerprint)
+
+    return render_json(
+        response,
+        {
+            "items": rows,
+            "count": total_count,
+            "count_type": count_type,
+            "limit": limit,
+            "offset": offset,
+        },
+    )
+
+
+@router.get("/cursor", response=CursorPaginatedItemsResponse, auth=AsyncJWTAuthWithCookie())
+async def list_items_by_cursor(
+    request,
+    response: HttpResponse,
+    limit: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous next_cursor"),
+    fields: Optional[str] = FIELDS_QUERY,
+    filters: ItemFilterSchema = Query(...),
+    sort: ItemSort = SORT_QUERY,
+):
+    """
+    List items with keyset (cursor) pagination.
+
+    Unlike limit/offset, the database never scans skipped rows, so latency
+    stays flat however deep the client pages.
+
+    Query Parameters:
+        - limit: Number of items to return (default: 10, max: 100)
+        - cursor: next_cursor value from the previous page (omit for the first page)
+        - fields: Only return (and only select) these item fields, e.g. ``id,name``
+        - name, min_price, max_price, sort: as for ``GET /items``; keep them the same
+          for every page of one listing (a cursor is only valid for its sort order)
+
+    Returns:
+        CursorPaginatedItemsResponse with items, limit, and next_cursor
+    """
+    schema = _item_schema(fields)
+    ordering = ITEM_ORDERINGS[sort]
+    # only() は主キーを必ず含むので、カーソルの id も取得される（並び替えの列も読む）
+    columns = dict.fromkeys((*schema_fields(schema), *(name.lstrip("-") for name in ordering)))
+    queryset = filters.filter(Item.objects.only(*columns))
+    try:
+        items, next_cursor = await paginate_keyset(queryset, ordering, limit, cursor)
+    except InvalidCursor as e:
+        raise HttpError(400, str(e))
+
+    return render_json(
+        response,
+        {
+            "items": [schema.model_validate(item).model_dump() for item in items],
+            "limit": limit,
+            "next_cursor": next_cursor,
+        },
+    )
 
-    # Get paginated items (native async iteration with slicing)
-    queryset = Item.objects.order_by('-id')[offset:offset + limit]
-    items = [item async for item in queryset]
 
-    return {
-        "items": items,
-        "count": total_count,
-        "limit": limit,
-        "offset": offset,
-    }
+def _check_bulk_size(rows: list) -> None:
+    if len(rows) > BULK_MAX_ROWS:
+        raise HttpError(413, f"A bulk request accepts at most {BULK_MAX_ROWS} rows")
+
+
+@router.post("/bulk", response=BulkItemsResponse, auth=AsyncJWTAuthWithCookie())
+async def bulk_create(request, data: List[ItemCreateSchema]):
+    """
+    Create many items in one request (single INSERT per batch, one transaction).
+
+    Rows failing validation are returned in ``errors`` and skipped.
+    """
+    _check_bulk_size(data)
+    items, errors = await bulk_create_items(data)
+    return {"items": items, "errors": errors}
+
+
+@router.put("/bulk", response=BulkItemsResponse, auth=AsyncJWTAuthWithCookie())
+async def bulk_update(request, data: List[ItemBulkUpdateSchema]):
+    """
+    Update many items in one request (one SELECT + one conditional UPDATE per batch).
+
+    Each row carries the version the client read. Unknown or duplicated ids,
+    invalid rows and rows whose item has changed since are returned in ``errors``.
+    """
+    _check_bulk_size(data)
+    items, errors = await bulk_update_items(data)
+    return {"items": items, "errors": errors}
+
+
+@router.delete("/bulk", response=BulkDeleteResponse, auth=AsyncJWTAuthWithCookie())
+async def bulk_delete(request, data: ItemBulkDeleteSchema):
+    """
+    Delete many items with one set-based DELETE.
+
+    Ids that do not exist and repeats of an id already in the request are
+    returned in ``errors``.
+    """
+    _check_bulk_size(data.ids)
+    deleted, errors = await bulk_delete_items(data.ids)
+    return {"deleted": deleted, "errors": errors}
+
+
+@router.get("/export", auth=AsyncJWTAuthWithCookie())
+async def export_items(
+    request,
+    format: ExportFormat = Query("ndjson", description="ndjson or csv"),
+):
+    """
+    Stream the whole item catalog as NDJSON (one JSON object per line) or CSV.
+
+    Rows are streamed from a server-side cursor, so memory use does not grow
+    with the table size.
+    """
+    return export_response(format)
 
 
 @router.get("/{item_id}", response=ItemSchema, auth=AsyncJWTAuthWithCookie())
-async def get_item(request, item_id: int):
-    return await aget_object_or_404(Item, id=item_id)
+@cache_response("items")
+async def get_item(
+    request, response: HttpResponse, item_id: int, fields: Optional[str] = FIELDS_QUERY
+):
+    schema = _item_schema(fields)
+    queryset = Item.objects.only(*schema_fields(schema), "updated")
+    item = await aget_object_or_404(queryset, id=item_id)
+    etag = item_etag(item, schema_fields(schema) if fields else None)
+    # If-None-Match が一致すればシリアライズせずに 304 を返す
+    unchanged = not_modified(request, etag)
+    if unchanged is not None:
+        return unchanged
+    response["ETag"] = etag
+    return render_json(response, schema.model_validate(item).model_dump())
 
 
 @router.post("", response=ItemSchema, auth=AsyncJWTAuthWithCookie())
@@ -56,16 +250,35 @@ async def create_item(request, data: ItemCreateSchema):
 
 
 @router.put("/{item_id}", response=ItemSchema, auth=AsyncJWTAuthWithCookie())
-async def update_item(request, item_id: int, data: ItemCreateSchema):
-    item = await aget_object_or_404(Item, id=item_id)
-    item.name = data.name
-    item.price = data.price
-    await item.asave()
-    return item
+async def update_item(request, item_id: int, data: ItemUpdateSchema):
+    """
+    Update an item if it is still at the version the client read.
+
+    One conditional UPDATE (WHERE id=? AND version=?): no prior SELECT and
+    no row lock. If another request updated the item first, nothing is
+    written and 409 is returned; the client re-reads and retries.
+    """
+    updated = await Item.objects.filter(id=item_id, version=data.version).aupdate(
+        name=data.name,
+        price=data.price,
+        version=F("version") + 1,
+        updated=timezone.now(),
+    )
+    if not updated:
+        if not await Item.objects.filter(id=item_id).aexists():
+            raise Http404
+        raise HttpError(409, "Item was modified by another request; reload and retry")
+
+    # update() はシグナルを送らないので、キャッシュ済みのレスポンスをここで無効化する
+    await abump_version("items")
+    return {"id": item_id, "name": data.name, "price": data.price, "version": data.version + 1}
 
 
 @router.delete("/{item_id}", auth=AsyncJWTAuthWithCookie())
 async def delete_item(request, item_id: int):
-    item = await aget_object_or_404(Item, id=item_id)
-    await item.adelete()
+    # 事前の SELECT なしで DELETE 1回（Django の高速削除）。削除件数 0 なら存在しない
+    deleted, _ = await Item.objects.filter(id=item_id).adelete()
+    if not deleted:
+        raise Http404
+    await ainvalidate_item_caches()
     return {"success": True}
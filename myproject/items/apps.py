@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ItemsConfig(AppConfig):
+    name = "items"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,170 @@
+"""
+Set-based create/update/delete for the items bulk endpoints.
+
+One request carries up to ``BULK_MAX_ROWS`` rows and each operation is a
+single statement or one statement per ``BULK_BATCH_SIZE`` rows, instead
+of one HTTP round trip and one transaction per row.
+
+Rows that fail validation are reported back with their index in the
+request and skipped; the remaining rows are still applied. Updates carry
+the ``version`` the client read, like ``PUT /items/{id}``: a row whose
+item has changed since is reported as a conflict instead of overwriting
+the newer data.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from .models import Item
+from .schemas import ItemBulkUpdateSchema, ItemCreateSchema
+from .signals import ainvalidate_item_caches
+
+BULK_MAX_ROWS = 1000
+BULK_BATCH_SIZE = 500
+
+RowError = Dict[str, object]
+
+# 送られた version が現在の値と違う（別のリクエストが先に更新した）行のエラー
+VERSION_CONFLICT = {"version": ["Item was modified by another request; reload and retry"]}
+
+
+def _row_error(index: int, errors: Dict[str, List[str]], item_id: Optional[int] = None) -> RowError:
+    return {"index": index, "id": item_id, "errors": errors}
+
+
+def _validate(item: Item) -> Dict[str, List[str]]:
+    """モデルのフィールド定義（max_length 等）で1行を検証する。DBには触れない"""
+    try:
+        item.clean_fields()
+    except ValidationError as e:
+        return e.message_dict
+    return {}
+
+
+async def bulk_create_items(
+    rows: Sequence[ItemCreateSchema],
+) -> Tuple[List[Item], List[RowError]]:
+    valid: List[Item] = []
+    errors: List[RowError] = []
+    for index, row in enumerate(rows):
+        item = Item(name=row.name, price=row.price)
+        row_errors = _validate(item)
+        if row_errors:
+            errors.append(_row_error(index, row_errors))
+        else:
+            valid.append(item)
+
+    if not valid:
+        return [], errors
+
+    # bulk_create は全バッチを1つのトランザクションで実行する
+    created = await Item.objects.abulk_create(valid, batch_size=BULK_BATCH_SIZE)
+    await ainvalidate_item_caches()
+    return created, errors
+
+
+async def bulk_update_items(
+    rows: Sequence[ItemBulkUpdateSchema],
+) -> Tuple[List[Item], List[RowError]]:
+    existing = await Item.objects.ain_bulk([row.id for row in rows])
+
+    now = timezone.now()
+    seen = set()
+    valid: List[Tuple[int, Item]] = []
+    errors: List[RowError] = []
+    for index, row in enumerate(rows):
+        if row.id in seen:
+            errors.append(_row_error(index, {"id": ["Duplicate id in request"]}, row.id))
+            continue
+        seen.add(row.id)
+
+        item = existing.get(row.id)
+        if item is None:
+            errors.append(_row_error(index, {"id": ["Not Found"]}, row.id))
+            continue
+        if item.version != row.version:
+            errors.append(_row_error(index, VERSION_CONFLICT, row.id))
+            continue
+
+        item.name = row.name
+        item.price = row.price
+        item.updated = now
+        item.version = row.version + 1
+        row_errors = _validate(item)
+        if row_errors:
+            errors.append(_row_error(index, row_errors, row.id))
+        else:
+            valid.append((index, item))
+
+    if not valid:
+        return [], errors
+
+    items = [item for _, item in valid]
+    # PUT /items/{id} と同じ WHERE id=? AND version=? の条件付き更新を、BULK_BATCH_SIZE 行ずつ
+    # UPDATE 1文（CASE WHEN）で行う。各文はDBがアトミックに適用する。行ごとに独立して
+    # 成否を返すので、バッチ間でトランザクションは不要
+    # （非同期ORMにはトランザクションAPIがなく、sync_to_async で包むこともしない）。
+    # 全行を1文にすると OR と CASE が SQLite の式の深さ上限（1000）を超える
+    written = 0
+    for start in range(0, len(items), BULK_BATCH_SIZE):
+        batch = items[start : start + BULK_BATCH_SIZE]
+        read_versions = Q()
+        for item in batch:
+            read_versions |= Q(id=item.id, version=item.version - 1)
+        written += await Item.objects.filter(read_versions).aupdate(
+            name=Case(*(When(id=item.id, then=Value(item.name)) for item in batch)),
+            price=Case(*(When(id=item.id, then=Value(item.price)) for item in batch)),
+            version=F("version") + 1,
+            updated=now,
+        )
+
+    if written < len(items):
+        # 読み込みから更新までの間に別のリクエストが書き込んだ行は WHERE に一致せず、
+        # 更新されていない。この UPDATE が書いた行は新しい version と updated（この時刻）を持つ
+        # (その後さらに書き換えられた行も競合として返るが、書き込みが失われることはない)
+        current = {
+            item_id: version
+            async for item_id, version in Item.objects.filter(
+                id__in=[item.id for item in items], updated=now
+            ).values_list("id", "version")
+        }
+        applied = {item.id for item in items if current.get(item.id) == item.version}
+        errors.extend(
+            _row_error(index, VERSION_CONFLICT, item.id)
+            for index, item in valid
+            if item.id not in applied
+        )
+        errors.sort(key=lambda error: error["index"])
+        items = [item for item in items if item.id in applied]
+
+    if items:
+        await ainvalidate_item_caches()
+    return items, errors
+
+
+async def bulk_delete_items(ids: Sequence[int]) -> Tuple[int, List[RowError]]:
+    unique_ids = list(dict.fromkeys(ids))
+    found = {
+        item_id
+        async for item_id in Item.objects.filter(id__in=unique_ids).values_list("id", flat=True)
+    }
+    seen = set()
+    errors: List[RowError] = []
+    for index, item_id in enumerate(ids):
+        # bulk_update_items と同じく、2回目以降の同じ id はエラーとして返す
+        if item_id in seen:
+            errors.append(_row_error(index, {"id": ["Duplicate id in request"]}, item_id))
+            continue
+        seen.add(item_id)
+        if item_id not in found:
+            errors.append(_row_error(index, {"id": ["Not Found"]}, item_id))
+
+    # 1回の DELETE ... WHERE id IN (...) で削除する（削除シグナルの受信側がないので、
+    # Django の高速削除になり対象行の再 SELECT もしない）
+    deleted, _ = await Item.objects.filter(id__in=found).adelete()
+    if deleted:
+        await ainvalidate_item_caches()
+    return deleted, errors
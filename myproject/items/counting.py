@@ -0,0 +1,99 @@
+"""
+Total-count strategies for the items list API.
+
+``SELECT COUNT(*)`` on PostgreSQL has to visit every visible row, so on a
+large table it becomes the most expensive query of a paginated listing.
+Clients choose per request how much accuracy they need:
+
+- ``exact``: run ``COUNT(*)`` every time (default, previous behaviour)
+- ``cached``: reuse an exact count for ``ITEMS_COUNT_CACHE_TTL`` seconds.
+  The cached value is dropped whenever an Item is created/updated/deleted.
+- ``estimated``: read the planner's row estimate (``pg_class.reltuples``).
+  Falls back to an exact count on other databases, on tables that were
+  never analyzed, and on small tables where ``COUNT(*)`` is cheap anyway.
+
+Every strategy returns ``(count, count_type)`` where ``count_type`` is the
+kind of number actually produced, so a fallback is visible to the client.
+A filtered count is always exact: the cached and estimated numbers are for
+the whole table.
+"""
+
+from typing import Literal, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q
+
+from .models import Item
+
+CountType = Literal["exact", "cached", "estimated"]
+
+COUNT_CACHE_KEY = "items:count"
+
+# これより小さい推定値なら COUNT(*) の方が安く、正確
+ESTIMATE_EXACT_BELOW = 1000
+
+
+async def exact_count() -> Tuple[int, CountType]:
+    return await Item.objects.acount(), "exact"
+
+
+async def cached_count() -> Tuple[int, CountType]:
+    count = await cache.aget(COUNT_CACHE_KEY)
+    if count is not None:
+        return count, "cached"
+
+    count, count_type = await exact_count()
+    await cache.aset(COUNT_CACHE_KEY, count, settings.ITEMS_COUNT_CACHE_TTL)
+    return count, count_type
+
+
+async def estimated_count() -> Tuple[int, CountType]:
+    if connections[Item.objects.db].vendor != "postgresql":
+        return await exact_count()
+
+    # 非同期で任意のSQLを読めるのは RawQuerySet の async for だけ（connection.cursor() は
+    # 同期APIで、sync_to_async で包むことはしない）。RawQuerySet は結果をモデルに詰めるため
+    # 主キー列を要求する。ダミーの id を返し、1行だけの Item から estimate を読む
+    query = Item.objects.raw(
+        "SELECT 1 AS id, reltuples::bigint AS estimate FROM pg_class WHERE oid = %s::regclass",
+        [Item._meta.db_table],
+    )
+    estimate = -1
+    async for row in query:
+        estimate = row.estimate
+
+    # reltuples = -1 は「一度も ANALYZE されていない」ことを示す
+    if estimate < ESTIMATE_EXACT_BELOW:
+        return await exact_count()
+    return estimate, "estimated"
+
+
+COUNT_STRATEGIES = {
+    "exact": exact_count,
+    "cached": cached_count,
+    "estimated": estimated_count,
+}
+
+
+async def count_items(
+    strategy: CountType = "exact", where: Optional[Q] = None
+) -> Tuple[int, CountType]:
+    """
+    Count all items using ``strategy``, or the items matching ``where``.
+
+    Returns ``(count, count_type)``.
+    """
+    if where:
+        # 絞り込み後の件数はキャッシュ・推定値では出せない（インデックスで COUNT する）
+        return await Item.objects.filter(where).acount(), "exact"
+    return await COUNT_STRATEGIES[strategy]()
+
+
+def invalidate_count_cache() -> None:
+    cache.delete(COUNT_CACHE_KEY)
+
+
+async def ainvalidate_count_cache() -> None:
+    await cache.adelete(COUNT_CACHE_KEY)
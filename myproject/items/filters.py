@@ -0,0 +1,51 @@
+"""
+Filters and sort orders for the items list, each backed by an index.
+
+``ItemFilterSchema`` is a Ninja ``FilterSchema`` read from the query
+string (``?name=ap&min_price=100&max_price=500``); fields left out are
+not applied. ``ITEM_ORDERINGS`` maps the ``sort=`` values to the
+``order_by()`` used for them.
+
+Only orders with an index behind them are accepted, so a sorted page is
+read in index order and never sorted in memory:
+
+- ``id`` / ``-id``: the primary key
+- ``price`` / ``-price``: ``item_price_id_idx`` (price, id)
+- ``name`` / ``-name``: ``item_name_id_idx`` (name, id)
+
+Every ordering ends in ``id``, so the order is total (stable pages for
+offset and cursor pagination); descending orders read the same index
+backwards. The price range uses ``item_price_id_idx`` and the name
+prefix the vendor-specific ``item_name_prefix_idx`` created in migration
+0004 (see ``Item.Meta``).
+"""
+
+from typing import Annotated, Dict, Literal, Optional, Tuple
+
+from ninja import FilterLookup, FilterSchema
+
+ItemSort = Literal["-id", "id", "price", "-price", "name", "-name"]
+
+ITEM_ORDERINGS: Dict[str, Tuple[str, ...]] = {
+    "-id": ("-id",),
+    "id": ("id",),
+    "price": ("price", "id"),
+    "-price": ("-price", "-id"),
+    "name": ("name", "id"),
+    "-name": ("-name", "-id"),
+}
+
+
+class ItemFilterSchema(FilterSchema):
+    """
+    Query-string filters for the items list.
+
+    Attributes:
+        name: Case-insensitive name prefix
+        min_price: Lowest price to include
+        max_price: Highest price to include
+    """
+
+    name: Annotated[Optional[str], FilterLookup("name__istartswith")] = None
+    min_price: Annotated[Optional[int], FilterLookup("price__gte")] = None
+    max_price: Annotated[Optional[int], FilterLookup("price__lte")] = None
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:07
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="item",
+            name="updated",
+            field=models.DateTimeField(
+                auto_now=True, db_default=django.db.models.functions.datetime.Now()
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0002_item_updated"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="item",
+            name="version",
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations, models
+
+# 名前の前方一致検索用インデックスはDBごとに定義が異なるため、SQLで作成する
+# - PostgreSQL: name__istartswith は UPPER(name::text) LIKE UPPER('x%') になるので、
+#   同じ式に text_pattern_ops の B-tree を張る（照合順序に関係なく LIKE 'x%' で使える）
+# - SQLite: 大文字小文字を区別しない LIKE 'x%' は NOCASE 照合のインデックスでしか最適化されない
+NAME_PREFIX_INDEXES = {
+    "postgresql": (
+        [
+            "CREATE INDEX IF NOT EXISTS item_name_prefix_idx "
+            "ON items_item (UPPER(name::text) text_pattern_ops)",
+        ],
+        ["DROP INDEX IF EXISTS item_name_prefix_idx"],
+    ),
+    "sqlite": (
+        [
+            "CREATE INDEX IF NOT EXISTS item_name_prefix_idx "
+            "ON items_item (name COLLATE NOCASE, id)",
+        ],
+        ["DROP INDEX IF EXISTS item_name_prefix_idx"],
+    ),
+}
+
+
+def create_name_prefix_index(apps, schema_editor):
+    forwards, _ = NAME_PREFIX_INDEXES.get(schema_editor.connection.vendor, ([], []))
+    for sql in forwards:
+        schema_editor.execute(sql)
+
+
+def drop_name_prefix_index(apps, schema_editor):
+    _, backwards = NAME_PREFIX_INDEXES.get(schema_editor.connection.vendor, ([], []))
+    for sql in backwards:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("items", "0003_item_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(fields=["price", "id"], name="item_price_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(fields=["name", "id"], name="item_name_id_idx"),
+        ),
+        migrations.RunPython(create_name_prefix_index, drop_name_prefix_index),
+    ]
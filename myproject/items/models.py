@@ -1,9 +1,25 @@
 from django.db import models
+from django.db.models.functions import Now
 
 
 class Item(models.Model):
     name = models.CharField(max_length=100)
     price = models.IntegerField()
+    # ETag の元になる最終更新日時（bulk_update では自動更新されないので明示的に設定する）
+    # db_default は既存行と、値を持たないフィクスチャ（loaddata）のため
+    updated = models.DateTimeField(auto_now=True, db_default=Now())
+    # 楽観的排他制御用のバージョン（PUT は WHERE version=? 付きの UPDATE 1回で更新する）
+    version = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            # 価格の範囲絞り込み + price 順の並び替え（id は同じ価格の並びを一意にする）
+            models.Index(fields=["price", "id"], name="item_price_id_idx"),
+            # name 順の並び替え（降順は同じインデックスを逆向きに読む）
+            models.Index(fields=["name", "id"], name="item_name_id_idx"),
+        ]
+        # 名前の前方一致検索用のインデックス（PostgreSQL: UPPER(name) text_pattern_ops /
+        # SQLite: NOCASE）はDBごとに定義が異なるため、マイグレーション 0004 の RunPython で作成する
 
     def __str__(self):
         return self.name
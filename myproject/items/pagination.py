@@ -0,0 +1,123 @@
+"""
+Keyset (cursor) pagination helpers for the items API.
+
+Limit/Offset pagination makes the database scan and discard ``offset`` rows
+on every request, so deep pages get slower the further the client goes.
+Keyset pagination instead remembers the sort key of the last row that was
+returned and asks for "rows after this key", which an index on the sort
+columns can answer in constant time regardless of depth.
+
+The cursor handed to clients is opaque: a URL-safe base64 encoded JSON
+document holding the ordering it was issued for and the key values of the
+last row of the page.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from django.core.exceptions import ValidationError
+from django.db.models import Model, Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or belongs to another ordering."""
+
+
+def _split(field: str) -> Tuple[str, bool]:
+    """'-price' -> ('price', True)"""
+    if field.startswith("-"):
+        return field[1:], True
+    return field, False
+
+
+def encode_cursor(ordering: Sequence[str], values: Sequence[Any]) -> str:
+    """Build an opaque cursor from the ordering and the last row's key values."""
+    payload = json.dumps({"o": list(ordering), "k": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, ordering: Sequence[str]) -> List[Any]:
+    """Decode a cursor and return its key values for ``ordering``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["k"]
+        issued_for = payload["o"]
+    except (binascii.Error, ValueError, TypeError, KeyError, UnicodeDecodeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+    if issued_for != list(ordering) or not isinstance(values, list):
+        raise InvalidCursor("Cursor does not match the requested ordering")
+    if len(values) != len(ordering):
+        raise InvalidCursor("Malformed cursor")
+    return values
+
+
+def check_key_types(model: Type[Model], ordering: Sequence[str], values: Sequence[Any]) -> None:
+    """
+    Reject key values that are not of their ordering field's type.
+
+    ``encode_cursor`` stores each value as the field holds it (an int for
+    ``id`` / ``price``, a str for ``name``), so a value the field would
+    convert (``"5"``, ``True``) or cannot take (``null``, lists, objects)
+    comes from a forged cursor.
+    """
+    for field, value in zip(ordering, values):
+        model_field = model._meta.get_field(_split(field)[0])
+        try:
+            cleaned = model_field.to_python(value)
+        except ValidationError as e:
+            raise InvalidCursor("Malformed cursor") from e
+        if value is None or type(cleaned) is not type(value):
+            raise InvalidCursor("Malformed cursor")
+
+
+def keyset_filter(ordering: Sequence[str], values: Sequence[Any]) -> Q:
+    """
+    Build the "row comes after ``values``" condition for ``ordering``.
+
+    For ordering (a, b, c) this expands to:
+        a > va OR (a = va AND b > vb) OR (a = va AND b = vb AND c > vc)
+    with ``>`` replaced by ``<`` for descending fields.
+    """
+    condition = Q()
+    for i, field in enumerate(ordering):
+        name, descending = _split(field)
+        lookup = "lt" if descending else "gt"
+        term = Q(**{f"{name}__{lookup}": values[i]})
+        for prev_field, prev_value in zip(ordering[:i], values[:i]):
+            term &= Q(**{_split(prev_field)[0]: prev_value})
+        condition |= term
+    return condition
+
+
+async def paginate_keyset(
+    queryset: QuerySet,
+    ordering: Sequence[str],
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    Fetch one page of ``queryset`` ordered by ``ordering``.
+
+    ``ordering`` must end with a unique column (normally ``id`` / ``-id``) so
+    that the key of every row is distinct. Returns the page rows and the
+    cursor for the next page (``None`` when this is the last page).
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, ordering)
+        check_key_types(queryset.model, ordering, values)
+        queryset = queryset.filter(keyset_filter(ordering, values))
+
+    # 1件多く取得して、次のページがあるかどうかを判定する
+    rows = [row async for row in queryset[: limit + 1]]
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    next_cursor = encode_cursor(ordering, [getattr(last, _split(f)[0]) for f in ordering])
+    return rows, next_cursor
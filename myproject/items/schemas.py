@@ -1,11 +1,13 @@
+from typing import Dict, List, Literal, Optional
+
 from ninja import Schema
-from typing import List
 
 
 class ItemSchema(Schema):
     id: int
     name: str
     price: int
+    version: int
 
 
 class ItemCreateSchema(Schema):
@@ -13,6 +15,59 @@ class ItemCreateSchema(Schema):
     price: int
 
 
+class ItemUpdateSchema(ItemCreateSchema):
+    """
+    Body of PUT /items/{id}.
+
+    Attributes:
+        version: The version the client last read; the update is rejected
+            with 409 if the item has been changed since
+    """
+
+    version: int
+
+
+class ItemBulkUpdateSchema(ItemUpdateSchema):
+    id: int
+
+
+class ItemBulkDeleteSchema(Schema):
+    ids: List[int]
+
+
+class BulkRowError(Schema):
+    """
+    Error for a single row of a bulk request.
+
+    Attributes:
+        index: Position of the row in the request body
+        id: Item id the row refers to (updates and deletes only)
+        errors: Field name -> error messages
+    """
+
+    index: int
+    id: Optional[int] = None
+    errors: Dict[str, List[str]]
+
+
+class BulkItemsResponse(Schema):
+    """
+    Response for bulk create/update.
+
+    Attributes:
+        items: Rows that were written
+        errors: Rows that were skipped, with the reason
+    """
+
+    items: List[ItemSchema]
+    errors: List[BulkRowError]
+
+
+class BulkDeleteResponse(Schema):
+    deleted: int
+    errors: List[BulkRowError]
+
+
 class PaginatedItemsResponse(Schema):
     """
     Paginated response for items list.
@@ -20,10 +75,28 @@ class PaginatedItemsResponse(Schema):
     Attributes:
         items: List of items for the current page
         count: Total number of items across all pages
+        count_type: How count was obtained (exact, cached, or estimated)
         limit: Number of items per page (requested)
         offset: Starting position for this page
     """
+
     items: List[ItemSchema]
     count: int
+    count_type: Literal["exact", "cached", "estimated"] = "exact"
     limit: int
     offset: int
+
+
+class CursorPaginatedItemsResponse(Schema):
+    """
+    Keyset (cursor) paginated response for items list.
+
+    Attributes:
+        items: List of items for the current page
+        limit: Number of items per page (requested)
+        next_cursor: Opaque cursor for the next page, null on the last page
+    """
+
+    items: List[ItemSchema]
+    limit: int
+    next_cursor: Optional[str] = None
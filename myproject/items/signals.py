@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from myproject.response_cache import abump_version, bump_version
+
+from .counting import ainvalidate_count_cache, invalidate_count_cache
+from .models import Item
+
+
+# post_delete は受けない: 受信側があると Django は削除を高速経路（DELETE 1回）で実行できず、
+# 対象行の SELECT + 行ごとのシグナルになる。削除する側（api.py / bulk.py / admin.py）で無効化する
+@receiver(post_save, sender=Item)
+def invalidate_item_caches(sender, **kwargs):
+    """Item の作成・更新でキャッシュ済みの件数とレスポンスを破棄する"""
+    invalidate_count_cache()
+    bump_version("items")
+
+
+async def ainvalidate_item_caches() -> None:
+    """シグナルを送らない書き込み（bulk_create / update()）と削除の後に呼ぶ"""
+    await ainvalidate_count_cache()
+    await abump_version("items")
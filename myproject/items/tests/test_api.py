@@ -80,6 +80,28 @@ async def test_delete_item_with_auth(async_client, auth_headers, db):
     assert exists is False
 
 
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_delete_item_single_query(async_client, auth_headers, query_budget, db):
+    item = await Item.objects.acreate(name="削除対象", price=50)
+
+    # 認証 1 + DELETE 1（事前の SELECT なし）。SQLite では Django の削除が開く
+    # トランザクションの BEGIN も数えられる
+    async with query_budget(3) as recorder:
+        response = await async_client.delete(f"/items/{item.id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert [shape for shape in recorder.shapes if "items_item" in shape] == [
+        'DELETE FROM "items_item" WHERE "items_item"."id" = %s'
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_delete_nonexistent_item(async_client, auth_headers, db):
+    response = await async_client.delete("/items/99999", headers=auth_headers)
+    assert response.status_code == 404
+
+
 @pytest.mark.django_db(transaction=True)
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
@@ -215,7 +237,7 @@ async def test_update_item_with_auth(async_client, auth_headers, db):
 
     response = await async_client.put(
         f"/items/{item.id}",
-        json={"name": "更新後", "price": 200},
+        json={"name": "更新後", "price": 200, "version": item.version},
         headers=auth_headers,
     )
     assert response.status_code == 200
@@ -224,6 +246,7 @@ async def test_update_item_with_auth(async_client, auth_headers, db):
     assert data["name"] == "更新後"
     assert data["price"] == 200
     assert data["id"] == item.id
+    assert data["version"] == item.version + 1
 
 
 @pytest.mark.django_db(transaction=True)
@@ -234,7 +257,7 @@ async def test_update_item_without_auth(async_client, db):
 
     response = await async_client.put(
         f"/items/{item.id}",
-        json={"name": "変更", "price": 200},
+        json={"name": "変更", "price": 200, "version": item.version},
     )
     assert response.status_code == 401
 
@@ -245,7 +268,77 @@ async def test_update_nonexistent_item(async_client, auth_headers, db):
     """Test updating a nonexistent item returns 404"""
     response = await async_client.put(
         "/items/99999",
-        json={"name": "存在しない", "price": 100},
+        json={"name": "存在しない", "price": 100, "version": 1},
         headers=auth_headers,
     )
     assert response.status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_update_item_stale_version_conflict(async_client, auth_headers, db):
+    """A PUT based on an outdated version is rejected and does not overwrite"""
+    item = await Item.objects.acreate(name="元", price=100)
+
+    first = await async_client.put(
+        f"/items/{item.id}",
+        json={"name": "先", "price": 200, "version": item.version},
+        headers=auth_headers,
+    )
+    assert first.status_code == 200
+
+    second = await async_client.put(
+        f"/items/{item.id}",
+        json={"name": "後", "price": 300, "version": item.version},
+        headers=auth_headers,
+    )
+    assert second.status_code == 409
+
+    await item.arefresh_from_db()
+    assert (item.name, item.price, item.version) == ("先", 200, 2)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_update_item_with_version_from_list(async_client, auth_headers, db):
+    """The /vanilla/ flow: edit with the listed version, reload the item on 409 and retry"""
+    item = await Item.objects.acreate(name="元", price=100)
+
+    listed = (await async_client.get("/items", headers=auth_headers)).json()["items"][0]
+    assert listed["version"] == item.version
+
+    # 一覧を読んだ後に他で更新される
+    await Item.objects.filter(id=item.id).aupdate(price=150, version=item.version + 1)
+
+    stale = await async_client.put(
+        f"/items/{item.id}",
+        json={"name": "新", "price": 200, "version": listed["version"]},
+        headers=auth_headers,
+    )
+    assert stale.status_code == 409
+
+    latest = (await async_client.get(f"/items/{item.id}", headers=auth_headers)).json()
+    assert (latest["price"], latest["version"]) == (150, item.version + 1)
+
+    retried = await async_client.put(
+        f"/items/{item.id}",
+        json={"name": "新", "price": 200, "version": latest["version"]},
+        headers=auth_headers,
+    )
+    assert retried.status_code == 200
+    assert retried.json()["version"] == latest["version"] + 1
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_update_item_single_query(async_client, auth_headers, query_budget, db):
+    item = await Item.objects.acreate(name="元", price=100)
+
+    # 認証 1 + 条件付き UPDATE 1
+    async with query_budget(2):
+        response = await async_client.put(
+            f"/items/{item.id}",
+            json={"name": "新", "price": 200, "version": item.version},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
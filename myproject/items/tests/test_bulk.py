@@ -0,0 +1,200 @@
+import pytest
+
+from items.bulk import BULK_MAX_ROWS
+from items.models import Item
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_create(async_client, auth_headers, db):
+    rows = [{"name": f"Item {i}", "price": 100 + i} for i in range(50)]
+
+    response = await async_client.post("/items/bulk", json=rows, headers=auth_headers)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["errors"] == []
+    assert len(data["items"]) == 50
+    assert all(item["id"] for item in data["items"])
+    assert await Item.objects.acount() == 50
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_create_reports_row_errors(async_client, auth_headers, db):
+    """Invalid rows are skipped and reported by index, valid rows are still created"""
+    rows = [
+        {"name": "正常", "price": 100},
+        {"name": "x" * 101, "price": 100},  # max_length=100 を超える
+        {"name": "正常2", "price": 200},
+    ]
+
+    response = await async_client.post("/items/bulk", json=rows, headers=auth_headers)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [item["name"] for item in data["items"]] == ["正常", "正常2"]
+    assert len(data["errors"]) == 1
+    assert data["errors"][0]["index"] == 1
+    assert "name" in data["errors"][0]["errors"]
+    assert await Item.objects.acount() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_create_too_many_rows(async_client, auth_headers, db):
+    rows = [{"name": "x", "price": 1}] * (BULK_MAX_ROWS + 1)
+    response = await async_client.post("/items/bulk", json=rows, headers=auth_headers)
+    assert response.status_code == 413
+    assert await Item.objects.acount() == 0
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_update(async_client, auth_headers, db):
+    a = await Item.objects.acreate(name="A", price=100)
+    b = await Item.objects.acreate(name="B", price=200)
+
+    rows = [
+        {"id": a.id, "name": "A2", "price": 110, "version": 1},
+        {"id": 99999, "name": "存在しない", "price": 1, "version": 1},
+        {"id": b.id, "name": "B2", "price": 220, "version": 1},
+        {"id": a.id, "name": "A3", "price": 120, "version": 1},  # 重複
+    ]
+    response = await async_client.put("/items/bulk", json=rows, headers=auth_headers)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert {(item["name"], item["version"]) for item in data["items"]} == {("A2", 2), ("B2", 2)}
+    assert [(e["index"], e["id"]) for e in data["errors"]] == [(1, 99999), (3, a.id)]
+
+    await a.arefresh_from_db()
+    await b.arefresh_from_db()
+    assert (a.name, a.price, a.version) == ("A2", 110, 2)
+    assert (b.name, b.price, b.version) == ("B2", 220, 2)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_update_max_rows(async_client, auth_headers, db):
+    """A full-size request is split into batches (one UPDATE of every row exceeds SQLite limits)"""
+    items = await Item.objects.abulk_create(
+        Item(name=f"Item {i}", price=i) for i in range(BULK_MAX_ROWS)
+    )
+
+    rows = [
+        {"id": item.id, "name": f"New {item.price}", "price": item.price + 1, "version": 1}
+        for item in items
+    ]
+    response = await async_client.put("/items/bulk", json=rows, headers=auth_headers)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["errors"] == []
+    assert len(data["items"]) == BULK_MAX_ROWS
+    assert await Item.objects.filter(version=2).acount() == BULK_MAX_ROWS
+    last = await Item.objects.aget(id=items[-1].id)
+    assert (last.name, last.price) == (f"New {BULK_MAX_ROWS - 1}", BULK_MAX_ROWS)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_stale_version(async_client, auth_headers, db):
+    a = await Item.objects.acreate(name="A", price=100, version=3)
+    b = await Item.objects.acreate(name="B", price=200)
+
+    rows = [
+        {"id": a.id, "name": "A2", "price": 110, "version": 2},
+        {"id": b.id, "name": "B2", "price": 220, "version": 1},
+    ]
+    response = await async_client.put("/items/bulk", json=rows, headers=auth_headers)
+
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [b.id]
+    assert [(e["index"], e["id"], list(e["errors"])) for e in data["errors"]] == [
+        (0, a.id, ["version"])
+    ]
+    await a.arefresh_from_db()
+    assert (a.name, a.version) == ("A", 3)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_update_does_not_overwrite_concurrent_put(
+    async_client, auth_headers, db, monkeypatch
+):
+    a = await Item.objects.acreate(name="A", price=100)
+    b = await Item.objects.acreate(name="B", price=200)
+
+    # 一括更新が行を読んだ直後に、PUT /items/{id} が a を更新する
+    read = Item.objects.ain_bulk
+
+    async def read_then_concurrent_put(*args, **kwargs):
+        rows = await read(*args, **kwargs)
+        put = {"name": "A (PUT)", "price": 150, "version": 1}
+        response = await async_client.put(f"/items/{a.id}", json=put, headers=auth_headers)
+        assert response.status_code == 200
+        return rows
+
+    monkeypatch.setattr(Item.objects, "ain_bulk", read_then_concurrent_put)
+    rows = [
+        {"id": a.id, "name": "A2", "price": 110, "version": 1},
+        {"id": b.id, "name": "B2", "price": 220, "version": 1},
+    ]
+    response = await async_client.put("/items/bulk", json=rows, headers=auth_headers)
+
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [b.id]
+    assert [(e["index"], e["id"], list(e["errors"])) for e in data["errors"]] == [
+        (0, a.id, ["version"])
+    ]
+    # PUT の書き込みが残り、version も PUT の分だけ進んでいる
+    await a.arefresh_from_db()
+    assert (a.name, a.price, a.version) == ("A (PUT)", 150, 2)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_delete(async_client, auth_headers, db):
+    a = await Item.objects.acreate(name="A", price=100)
+    b = await Item.objects.acreate(name="B", price=200)
+    c = await Item.objects.acreate(name="C", price=300)
+
+    response = await async_client.delete(
+        "/items/bulk", json={"ids": [a.id, b.id, 99999]}, headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["deleted"] == 2
+    assert [(e["index"], e["id"]) for e in data["errors"]] == [(2, 99999)]
+    assert [item.id async for item in Item.objects.all()] == [c.id]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_delete_reports_duplicate_ids(async_client, auth_headers, db):
+    a = await Item.objects.acreate(name="A", price=100)
+
+    response = await async_client.delete(
+        "/items/bulk", json={"ids": [a.id, a.id, 99999]}, headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["deleted"] == 1
+    assert [(e["index"], e["id"], e["errors"]["id"]) for e in data["errors"]] == [
+        (1, a.id, ["Duplicate id in request"]),
+        (2, 99999, ["Not Found"]),
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_endpoints_require_auth(async_client, db):
+    response = await async_client.post("/items/bulk", json=[{"name": "x", "price": 1}])
+    assert response.status_code == 401
+    response = await async_client.put("/items/bulk", json=[])
+    assert response.status_code == 401
+    response = await async_client.delete("/items/bulk", json={"ids": [1]})
+    assert response.status_code == 401
@@ -0,0 +1,85 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+
+from items.counting import COUNT_CACHE_KEY, ESTIMATE_EXACT_BELOW, count_items
+from items.models import Item
+from myproject.response_cache import abump_version
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_count_mode_defaults_to_exact(async_client, auth_headers, db):
+    await Item.objects.acreate(name="りんご", price=100)
+
+    response = await async_client.get("/items", headers=auth_headers)
+    data = response.json()
+    assert data["count"] == 1
+    assert data["count_type"] == "exact"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cached_count_is_reused(async_client, auth_headers, db):
+    """The second request is served from the cache instead of COUNT(*)"""
+    await Item.objects.acreate(name="りんご", price=100)
+
+    response = await async_client.get("/items?count_mode=cached", headers=auth_headers)
+    assert response.json()["count_type"] == "exact"  # cache miss -> fresh count
+
+    # キャッシュ値を書き換えて、DBではなくキャッシュから返ることを確認する
+    await cache.aset(COUNT_CACHE_KEY, 42)
+    # 一覧のレスポンス自体もキャッシュされているので、それだけ破棄して件数の取得を通す
+    await abump_version("items")
+    response = await async_client.get("/items?count_mode=cached", headers=auth_headers)
+    data = response.json()
+    assert data["count"] == 42
+    assert data["count_type"] == "cached"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cached_count_invalidated_on_write(async_client, auth_headers, db):
+    item = await Item.objects.acreate(name="りんご", price=100)
+    await async_client.get("/items?count_mode=cached", headers=auth_headers)
+    assert await cache.aget(COUNT_CACHE_KEY) == 1
+
+    await async_client.post("/items", json={"name": "みかん", "price": 80}, headers=auth_headers)
+    assert await cache.aget(COUNT_CACHE_KEY) is None
+
+    await async_client.get("/items?count_mode=cached", headers=auth_headers)
+    await async_client.delete(f"/items/{item.id}", headers=auth_headers)
+    assert await cache.aget(COUNT_CACHE_KEY) is None
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_estimated_count_falls_back_to_exact(async_client, auth_headers, db):
+    """Small tables (and non-PostgreSQL databases) get an exact count"""
+    await Item.objects.acreate(name="りんご", price=100)
+
+    response = await async_client.get("/items?count_mode=estimated", headers=auth_headers)
+    data = response.json()
+    assert data["count"] == 1
+    assert data["count_type"] == "exact"
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="reltuples is PostgreSQL-only")
+@pytest.mark.django_db(transaction=True)
+def test_estimated_count_reads_planner_statistics():
+    rows = ESTIMATE_EXACT_BELOW + 500
+    Item.objects.bulk_create([Item(name=f"Item {i}", price=i) for i in range(rows)])
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Item._meta.db_table}")
+
+    count, count_type = async_to_sync(count_items)("estimated")
+    assert count_type == "estimated"
+    assert count == pytest.approx(rows, rel=0.1)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_invalid_count_mode(async_client, auth_headers, db):
+    response = await async_client.get("/items?count_mode=guess", headers=auth_headers)
+    assert response.status_code == 422
@@ -0,0 +1,99 @@
+import pytest
+from django.core.cache import cache
+
+from items.models import Item
+
+
+def _if_none_match(auth_headers, etag):
+    # Ninja のテストクライアントはヘッダー名を大文字化せずに META へ入れるため、
+    # get_conditional_response が読む HTTP_IF_NONE_MATCH になるよう大文字で渡す
+    return {**auth_headers, "IF-NONE-MATCH": etag}
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_get_item_not_modified(async_client, auth_headers):
+    item = await Item.objects.acreate(name="りんご", price=100)
+
+    response = await async_client.get(f"/items/{item.id}", headers=auth_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    headers = _if_none_match(auth_headers, etag)
+    response = await async_client.get(f"/items/{item.id}", headers=headers)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_get_item_etag_changes_after_update(async_client, auth_headers):
+    item = await Item.objects.acreate(name="りんご", price=100)
+    response = await async_client.get(f"/items/{item.id}", headers=auth_headers)
+    etag = response.headers["ETag"]
+
+    await async_client.put(
+        f"/items/{item.id}",
+        json={"name": "りんご", "price": 120, "version": 1},
+        headers=auth_headers,
+    )
+
+    headers = _if_none_match(auth_headers, etag)
+    response = await async_client.get(f"/items/{item.id}", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["price"] == 120
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_list_items_not_modified_without_cache(async_client, auth_headers, query_budget):
+    """The 304 is decided from one aggregate query, not from the cached body"""
+    for i in range(5):
+        await Item.objects.acreate(name=f"Item {i}", price=100 + i)
+
+    response = await async_client.get("/items?limit=3", headers=auth_headers)
+    etag = response.headers["ETag"]
+    await cache.aclear()
+
+    headers = _if_none_match(auth_headers, etag)
+    # 認証 1 + 件数 1 + ページの指紋 1（行は取得しない）
+    async with query_budget(3):
+        response = await async_client.get("/items?limit=3", headers=headers)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+@pytest.mark.parametrize("change", ["create", "update", "delete"])
+async def test_list_items_etag_changes(async_client, auth_headers, change):
+    items = [await Item.objects.acreate(name=f"Item {i}", price=100 + i) for i in range(3)]
+    response = await async_client.get("/items", headers=auth_headers)
+    etag = response.headers["ETag"]
+
+    if change == "create":
+        await async_client.post("/items", json={"name": "New", "price": 1}, headers=auth_headers)
+    elif change == "update":
+        await async_client.put(
+            f"/items/{items[0].id}",
+            json={"name": "Renamed", "price": 1, "version": 1},
+            headers=auth_headers,
+        )
+    else:
+        await async_client.delete(f"/items/{items[0].id}", headers=auth_headers)
+
+    headers = _if_none_match(auth_headers, etag)
+    response = await async_client.get("/items", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_list_items_etag_depends_on_query(async_client, auth_headers):
+    await Item.objects.acreate(name="りんご", price=100)
+    first = await async_client.get("/items?limit=5", headers=auth_headers)
+    second = await async_client.get("/items?limit=6", headers=auth_headers)
+    assert first.headers["ETag"] != second.headers["ETag"]
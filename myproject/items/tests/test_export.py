@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+
+import pytest
+from django.test import AsyncClient
+
+from items.models import Item
+
+
+async def _read(response):
+    return b"".join([chunk async for chunk in response.streaming_content]).decode()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_export_ndjson(auth_headers, db):
+    await Item.objects.acreate(name="りんご", price=100)
+    await Item.objects.acreate(name="みかん", price=80)
+
+    response = await AsyncClient().get("/api/items/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in (await _read(response)).splitlines()]
+    assert [(row["name"], row["price"]) for row in rows] == [("りんご", 100), ("みかん", 80)]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_export_csv(auth_headers, db):
+    await Item.objects.acreate(name="りんご", price=100)
+
+    response = await AsyncClient().get("/api/items/export?format=csv", headers=auth_headers)
+    assert response.status_code == 200
+    assert response["Content-Disposition"] == 'attachment; filename="items.csv"'
+
+    rows = list(csv.reader(io.StringIO(await _read(response))))
+    assert rows[0] == ["id", "name", "price"]
+    assert rows[1][1:] == ["りんご", "100"]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_export_without_auth(db):
+    response = await AsyncClient().get("/api/items/export")
+    assert response.status_code == 401
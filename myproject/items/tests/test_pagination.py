@@ -0,0 +1,86 @@
+import pytest
+
+from items.models import Item
+from items.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(["-id"], [42])
+    assert decode_cursor(cursor, ["-id"]) == [42]
+
+
+def test_cursor_rejects_other_ordering():
+    cursor = encode_cursor(["-id"], [42])
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, ["price", "id"])
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cursor_pagination_walks_all_pages(async_client, auth_headers, db):
+    """Following next_cursor visits every item exactly once, newest first"""
+    for i in range(7):
+        await Item.objects.acreate(name=f"Item {i}", price=100 + i)
+
+    names = []
+    cursor = None
+    while True:
+        url = "/items/cursor?limit=3" + (f"&cursor={cursor}" if cursor else "")
+        response = await async_client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["limit"] == 3
+        names.extend(item["name"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert names == [f"Item {i}" for i in range(6, -1, -1)]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cursor_pagination_last_page_has_no_cursor(async_client, auth_headers, db):
+    """A page that holds the remaining items exactly does not return a next_cursor"""
+    await Item.objects.acreate(name="Item 1", price=100)
+    await Item.objects.acreate(name="Item 2", price=200)
+
+    response = await async_client.get("/items/cursor?limit=2", headers=auth_headers)
+    data = response.json()
+    assert len(data["items"]) == 2
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cursor_pagination_invalid_cursor(async_client, auth_headers, db):
+    response = await async_client.get("/items/cursor?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+@pytest.mark.parametrize("key", ["abc", "5", None, True, [1], {"a": 1}])
+async def test_cursor_pagination_rejects_mistyped_key(async_client, auth_headers, key):
+    # 復号はできるが、id の値として正しくない型のカーソル
+    cursor = encode_cursor(["-id"], [key])
+    response = await async_client.get(f"/items/cursor?cursor={cursor}", headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cursor_pagination_rejects_mistyped_name_key(async_client, auth_headers):
+    cursor = encode_cursor(["name", "id"], [5, 1])
+    response = await async_client.get(
+        f"/items/cursor?sort=name&cursor={cursor}", headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cursor_pagination_without_auth(async_client, db):
+    response = await async_client.get("/items/cursor")
+    assert response.status_code == 401
@@ -0,0 +1,44 @@
+import pytest
+
+from items.models import Item
+
+# 認証（ユーザー取得）1 + 件数 1 + 一覧 1
+LIST_ITEMS_BUDGET = 3
+# 認証 1 + 一覧 1（次ページの有無は limit+1 件の取得で判定する）
+CURSOR_ITEMS_BUDGET = 2
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rows", [1, 25])
+async def test_list_items_query_budget(async_client, auth_headers, query_budget, rows):
+    """The number of queries does not grow with the number of items on the page"""
+    for i in range(rows):
+        await Item.objects.acreate(name=f"Item {i}", price=100 + i)
+
+    async with query_budget(LIST_ITEMS_BUDGET, max_duplicates=0):
+        response = await async_client.get("/items?limit=50", headers=auth_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cursor_items_query_budget(async_client, auth_headers, query_budget):
+    for i in range(10):
+        await Item.objects.acreate(name=f"Item {i}", price=100 + i)
+
+    async with query_budget(CURSOR_ITEMS_BUDGET, max_duplicates=0):
+        response = await async_client.get("/items/cursor?limit=5", headers=auth_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_query_budget_detects_n_plus_one(query_budget, db):
+    for i in range(3):
+        await Item.objects.acreate(name=f"Item {i}", price=100 + i)
+
+    with pytest.raises(AssertionError, match="duplicated"):
+        async with query_budget(10, max_duplicates=0):
+            async for item in Item.objects.all():
+                await Item.objects.aget(pk=item.pk)
@@ -0,0 +1,91 @@
+import pytest
+
+from items.models import Item
+from items.schemas import ItemSchema
+from myproject.sparse_fields import InvalidFields, parse_fields, partial_schema
+
+
+def _item_selects(recorder):
+    return [shape for shape in recorder.shapes if 'FROM "items_item"' in shape]
+
+
+def test_parse_fields_uses_schema_order():
+    assert parse_fields("name, id", ItemSchema) == ("id", "name")
+    assert parse_fields(None, ItemSchema) is None
+
+
+@pytest.mark.parametrize("value", ["id,colour", "", ","])
+def test_parse_fields_rejects_unknown_or_empty(value):
+    with pytest.raises(InvalidFields):
+        parse_fields(value, ItemSchema)
+
+
+def test_partial_schema_is_cached_per_field_set():
+    schema = partial_schema(ItemSchema, ("id", "name"))
+    assert schema is partial_schema(ItemSchema, ("id", "name"))
+    assert tuple(schema.model_fields) == ("id", "name")
+    assert partial_schema(ItemSchema, ("id", "name", "price", "version")) is ItemSchema
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_list_items_sparse_fields(async_client, auth_headers, query_budget):
+    await Item.objects.acreate(name="りんご", price=100)
+
+    async with query_budget(3) as recorder:
+        response = await async_client.get("/items?fields=name", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["items"] == [{"name": "りんご"}]
+    # ETag 用の id / updated は取得するが、price / version は SELECT しない
+    (select,) = [shape for shape in _item_selects(recorder) if "ORDER BY" in shape]
+    assert '"price"' not in select and '"version"' not in select
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_list_items_sparse_fields_change_etag(async_client, auth_headers):
+    await Item.objects.acreate(name="りんご", price=100)
+    full = await async_client.get("/items", headers=auth_headers)
+    sparse = await async_client.get("/items?fields=id,name", headers=auth_headers)
+    assert full.headers["ETag"] != sparse.headers["ETag"]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_get_item_sparse_fields(async_client, auth_headers, query_budget):
+    item = await Item.objects.acreate(name="りんご", price=100)
+
+    async with query_budget(2) as recorder:
+        response = await async_client.get(f"/items/{item.id}?fields=id,price", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {"id": item.id, "price": 100}
+    (select,) = _item_selects(recorder)
+    assert '"name"' not in select
+
+    full = await async_client.get(f"/items/{item.id}", headers=auth_headers)
+    assert full.json() == {"id": item.id, "name": "りんご", "price": 100, "version": 1}
+    assert full.headers["ETag"] != response.headers["ETag"]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_cursor_items_sparse_fields(async_client, auth_headers):
+    for i in range(3):
+        await Item.objects.acreate(name=f"Item {i}", price=100 + i)
+
+    response = await async_client.get("/items/cursor?limit=2&fields=name", headers=auth_headers)
+    data = response.json()
+    assert data["items"] == [{"name": "Item 2"}, {"name": "Item 1"}]
+
+    response = await async_client.get(
+        f"/items/cursor?limit=2&fields=name&cursor={data['next_cursor']}", headers=auth_headers
+    )
+    assert response.json()["items"] == [{"name": "Item 0"}]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_unknown_field_is_rejected(async_client, auth_headers):
+    response = await async_client.get("/items?fields=id,colour", headers=auth_headers)
+    assert response.status_code == 400
+    assert "colour" in response.json()["detail"]
@@ -1,10 +1,11 @@
 from django.conf import settings as django_settings
-from django.contrib.auth import authenticate
 from django.http import HttpResponse
 from ninja import Router, Schema
 from ninja.responses import Response
 from ninja_jwt.tokens import RefreshToken
 
+from .password_hashing import HashingOverloaded, aauthenticate_user
+
 router = Router()
 
 
@@ -14,12 +15,18 @@ class LoginInput(Schema):
     password: str
 
 
-# 👇 2. async を外して def にする（DB操作があるため）
+# 👇 2. async def にする（ユーザー取得は非同期ORM、パスワード検証は専用スレッドプール）
 # 👇 3. 引数に data: LoginInput を指定する
 @router.post("/login")
-def login(request, data: LoginInput):
+async def login(request, data: LoginInput):
     # data.username, data.password でアクセスする
-    user = authenticate(username=data.username, password=data.password)
+    try:
+        user = await aauthenticate_user(data.username, data.password)
+    except HashingOverloaded:
+        # ログインが殺到している場合は待たせずに 503 を返す（他のAPIを巻き込まない）
+        response = Response({"detail": "Too many login attempts, retry shortly"}, status=503)
+        response["Retry-After"] = "1"
+        return response
 
     if user is None:
         return Response({"detail": "Invalid credentials"}, status=401)
@@ -0,0 +1,68 @@
+"""
+JSON renderer and parser for the Ninja API backed by orjson.
+
+Ninja's default ``JSONRenderer`` runs the stdlib ``json`` encoder (pure
+Python for anything but the simplest values) over the dicts produced by
+the response schema; for a 100-item page that is a visible share of the
+request's CPU time. ``FastJSONRenderer`` / ``FastJSONParser`` use orjson
+when it is installed and fall back to the stdlib otherwise (the fallback
+still drops the whitespace after ``,`` and ``:``).
+
+Both backends produce the same values: anything orjson does not encode
+natively goes through Ninja's ``NinjaJSONEncoder`` (pydantic models,
+``Decimal``, ``Url`` ...), and datetimes are passed through to it as well,
+so they keep Django's format (milliseconds, ``Z`` for UTC) instead of
+orjson's.
+
+    api = NinjaExtraAPI(renderer=FastJSONRenderer(), parser=FastJSONParser())
+"""
+
+import json
+from typing import Any, Optional
+
+from ninja.parser import Parser
+from ninja.renderers import JSONRenderer
+from ninja.responses import NinjaJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson は依存関係に含まれるが、無くても動くようにする
+    orjson = None
+
+BACKENDS = ("orjson", "stdlib")
+DEFAULT_BACKEND = "orjson" if orjson is not None else "stdlib"
+
+_encoder = NinjaJSONEncoder()
+
+if orjson is not None:
+    # 日時は NinjaJSONEncoder（DjangoJSONEncoder）に任せて、stdlib 版と同じ表記にする
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def _check_backend(backend: Optional[str]) -> str:
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {backend!r}; expected one of {BACKENDS}")
+    if backend == "orjson" and orjson is None:
+        raise ValueError("The orjson JSON backend requires the orjson package")
+    return backend
+
+
+class FastJSONRenderer(JSONRenderer):
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = _check_backend(backend)
+
+    def render(self, request, data: Any, *, response_status: int) -> Any:
+        if self.backend == "orjson":
+            return orjson.dumps(data, default=_encoder.default, option=ORJSON_OPTIONS)
+        return json.dumps(data, cls=self.encoder_class, separators=(",", ":"))
+
+
+class FastJSONParser(Parser):
+    def __init__(self, backend: Optional[str] = None):
+        self.backend = _check_backend(backend)
+
+    def parse_body(self, request):
+        if self.backend == "orjson":
+            return orjson.loads(request.body)
+        return json.loads(request.body)
@@ -0,0 +1,136 @@
+"""
+In-process latency histograms (HDR-style) exported in Prometheus text format.
+
+Each histogram counts samples in log-linear buckets: every power of two
+(in microseconds) is split into ``SUB_BUCKETS`` equal sub-buckets, so any
+recorded value is known to within 1/SUB_BUCKETS (12.5%) of its true value
+from 1 µs up to ~2 minutes, with a fixed 200 counters per histogram. Recording
+is a couple of integer operations under a lock, and percentiles come from
+the same counts.
+
+For Prometheus the fine buckets are summed at power-of-two boundaries,
+which coincide with fine bucket edges, so the exported ``le`` counts are
+exact rather than interpolated.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_EXPONENT = 26  # 2**27 µs ≈ 134 秒まで（これ以上は最後のバケットに入れる）
+BUCKET_COUNT = (MAX_EXPONENT - SUB_BUCKET_BITS + 2) * SUB_BUCKETS
+# Prometheus に出す le 境界（2**10 µs ≈ 1 ms から 2**25 µs ≈ 33.5 s）
+EXPORT_EXPONENTS = range(10, 26)
+
+
+def bucket_index(micros: int) -> int:
+    """Index of the fine bucket holding ``micros`` (values below SUB_BUCKETS are exact)."""
+    if micros < SUB_BUCKETS:
+        return max(micros, 0)
+    exponent = micros.bit_length() - 1
+    sub = (micros >> (exponent - SUB_BUCKET_BITS)) - SUB_BUCKETS
+    return min((exponent - SUB_BUCKET_BITS + 1) * SUB_BUCKETS + sub, BUCKET_COUNT - 1)
+
+
+def bucket_upper_bound(index: int) -> int:
+    """Largest value (µs) that falls into fine bucket ``index``."""
+    if index < SUB_BUCKETS:
+        return index
+    exponent = index // SUB_BUCKETS + SUB_BUCKET_BITS - 1
+    sub = index % SUB_BUCKETS
+    width = 1 << (exponent - SUB_BUCKET_BITS)
+    return (1 << exponent) + (sub + 1) * width - 1
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        index = bucket_index(int(seconds * 1_000_000))
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_seconds += seconds
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound (seconds) of the bucket holding the given percentile."""
+        with self._lock:
+            counts, count = list(self.counts), self.count
+        if not count:
+            return 0.0
+        rank = max(1, round(count * percent / 100))
+        seen = 0
+        for index, n in enumerate(counts):
+            seen += n
+            if seen >= rank:
+                return bucket_upper_bound(index) / 1_000_000
+        return bucket_upper_bound(BUCKET_COUNT - 1) / 1_000_000
+
+    def cumulative(self, exponents: Iterable[int]) -> List[Tuple[float, int]]:
+        """``(le_seconds, samples below le)`` pairs at power-of-two microsecond boundaries."""
+        with self._lock:
+            counts = list(self.counts)
+        result = []
+        for exponent in exponents:
+            # 2**exponent µs 未満の値は、この境界より前のバケットにちょうど収まる
+            end = bucket_index(1 << exponent)
+            result.append(((1 << exponent) / 1_000_000, sum(counts[:end])))
+        return result
+
+
+class LatencyRegistry:
+    """Histograms keyed by (route, method, status)."""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, method: str, status: int, seconds: float) -> None:
+        key = (route, method, str(status))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        histogram.record(seconds)
+
+    def get(self, route: str, method: str, status: int) -> LatencyHistogram:
+        return self._histograms[(route, method, str(status))]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self, name: str = "api_request_duration_seconds") -> str:
+        with self._lock:
+            items = sorted(self._histograms.items())
+
+        lines = [
+            f"# HELP {name} Latency of API requests by route, method and status.",
+            f"# TYPE {name} histogram",
+        ]
+        quantile_lines = [
+            f"# HELP {name}_quantile Latency percentiles from the same histograms.",
+            f"# TYPE {name}_quantile gauge",
+        ]
+        for (route, method, status), histogram in items:
+            labels = f'route="{_escape(route)}",method="{method}",status="{status}"'
+            for le, count in histogram.cumulative(EXPORT_EXPONENTS):
+                lines.append(f'{name}_bucket{{{labels},le="{le:g}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total_seconds:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+            for percent in (50, 90, 99):
+                quantile_lines.append(
+                    f'{name}_quantile{{{labels},quantile="{percent / 100:g}"}} '
+                    f"{histogram.percentile(percent):.6f}"
+                )
+        return "\n".join(lines + quantile_lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
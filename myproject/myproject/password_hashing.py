@@ -0,0 +1,91 @@
+"""
+Dedicated, size-limited executor for password hashing.
+
+PBKDF2 is deliberately slow (hundreds of ms of CPU). If login ran it in
+the default thread pool used by ``sync_to_async``, a login burst would
+occupy every thread and stall the async API endpoints that share that
+pool. Instead hashes run here:
+
+- at most ``LOGIN_HASH_WORKERS`` hashes run at once (one per thread;
+  ``hashlib.pbkdf2_hmac`` releases the GIL while it works)
+- at most ``LOGIN_HASH_MAX_PENDING`` logins may be running or waiting;
+  beyond that ``HashingOverloaded`` is raised so the caller can answer
+  503 right away instead of queueing without bound (back-pressure)
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password, verify_password
+
+
+class HashingOverloaded(Exception):
+    """Raised when too many password hashes are already running or queued."""
+
+
+class PasswordHashingPool:
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        # WSGI (runserver 等) では非同期ビューがリクエストごとに別スレッドの
+        # イベントループで動くので、pending の確認と増減はロックで守る
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise HashingOverloaded
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+
+hashing_pool = PasswordHashingPool(
+    max_workers=settings.LOGIN_HASH_WORKERS,
+    max_pending=settings.LOGIN_HASH_MAX_PENDING,
+)
+
+
+async def aauthenticate_user(username: str, password: str) -> Optional[Any]:
+    """
+    Async equivalent of ``authenticate()`` for ModelBackend.
+
+    The user is fetched with the async ORM and the password is verified on
+    ``hashing_pool``. Raises ``HashingOverloaded`` when the pool is full.
+    """
+    UserModel = get_user_model()
+    try:
+        user = await UserModel._default_manager.aget_by_natural_key(username)
+    except UserModel.DoesNotExist:
+        # 存在しないユーザーでも1回ハッシュ計算して、応答時間の差をなくす (Django #20760)
+        await hashing_pool.run(make_password, password)
+        return None
+
+    is_correct, must_update = await hashing_pool.run(verify_password, password, user.password)
+    if not is_correct or not user.is_active:
+        return None
+
+    if must_update:
+        # ハッシュのアルゴリズムや反復回数が古い場合は再ハッシュして保存する
+        user.password = await hashing_pool.run(make_password, password)
+        await user.asave(update_fields=["password"])
+    return user
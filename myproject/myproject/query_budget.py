@@ -0,0 +1,257 @@
+"""
+Per-request SQL instrumentation: query count, SQL time and N+1 detection.
+
+Every database connection gets an execute wrapper that reports to the
+``QueryRecorder`` stored in a ContextVar. ContextVars follow the request
+into ``sync_to_async`` threads, so queries issued by the async ORM of the
+Ninja API are attributed to the right request just like those of the sync
+template views. When no recorder is active the wrapper only does one
+ContextVar lookup.
+
+This is the only SQL instrumentation in the project: middlewares that need
+per-request SQL numbers open ``recording()``, which joins the recorder the
+request already has, so each query is timed once however many of them
+look at it (``ServerTimingMiddleware`` derives its ``db`` phase from it).
+
+``QueryBudgetMiddleware`` records each request and, when enabled
+(``QUERY_BUDGET["ENABLED"]``):
+
+- adds ``X-Query-Count``, ``X-Query-Time-Ms`` and ``X-Query-Duplicates``
+  response headers
+- logs a warning listing the repeated SQL shapes when the route's budget
+  (``QUERY_BUDGET["ROUTES"][view_name]`` or ``QUERY_BUDGET["DEFAULT"]``)
+  is exceeded, or raises ``QueryBudgetExceeded`` if ``QUERY_BUDGET["RAISE"]``
+
+``assert_query_budget`` is the same check as a context manager for tests
+(also exposed as the ``query_budget`` pytest fixture in conftest.py).
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+_current_recorder: ContextVar[Optional["QueryRecorder"]] = ContextVar(
+    "query_recorder", default=None
+)
+
+_PLACEHOLDER_LISTS = re.compile(r"%s(?:\s*,\s*%s)+")
+_STRING_LITERALS = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERALS = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Reduce a SQL statement to its shape so that repeated queries compare equal.
+
+    Parameters are already ``%s`` placeholders; this additionally collapses
+    ``IN (%s, %s, ...)`` lists and replaces inlined literals (LIMIT/OFFSET
+    numbers, quoted strings) with ``?``.
+    """
+    sql = _STRING_LITERALS.sub("?", sql)
+    sql = _PLACEHOLDER_LISTS.sub("%s...", sql)
+    sql = _NUMBER_LITERALS.sub("?", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request or test block issues more queries than its budget."""
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, sql: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[normalize_sql(sql)] += 1
+
+    @property
+    def duplicates(self) -> Dict[str, int]:
+        """SQL shapes executed more than once (the usual N+1 signature)."""
+        return {shape: n for shape, n in self.shapes.items() if n > 1}
+
+    @property
+    def duplicate_count(self) -> int:
+        return sum(n - 1 for n in self.duplicates.values())
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries in {self.duration * 1000:.1f} ms"]
+        for shape, n in sorted(self.duplicates.items(), key=lambda item: -item[1]):
+            lines.append(f"  {n}x {shape}")
+        return "\n".join(lines)
+
+
+def _record_query(execute, sql, params, many, context):
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.record(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(connection) -> None:
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def install_on_open_connections() -> None:
+    """Install the wrapper on connections of this thread opened before this module loaded."""
+    for connection in connections.all(initialized_only=True):
+        install_query_recorder(connection)
+
+
+_swept_async_thread = False
+
+
+async def ainstall_on_open_connections() -> None:
+    """
+    Run ``install_on_open_connections`` once in the thread the async ORM uses.
+
+    Connections opened there later get the wrapper from ``connection_created``.
+    """
+    global _swept_async_thread
+    if not _swept_async_thread:
+        await sync_to_async(install_on_open_connections)()
+        _swept_async_thread = True
+
+
+@receiver(connection_created)
+def _install_on_connect(sender, connection, **kwargs):
+    install_query_recorder(connection)
+
+
+@contextmanager
+def recording():
+    """Record the block's SQL into the active recorder, or into a new one if there is none."""
+    recorder = _current_recorder.get()
+    if recorder is not None:
+        yield recorder
+        return
+    recorder = QueryRecorder()
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+class assert_query_budget:
+    """
+    Fail if the block issues more than ``max_queries`` queries or repeats a
+    SQL shape more than ``max_duplicates`` extra times.
+
+        with assert_query_budget(3):
+            ...
+        async with assert_query_budget(2, max_duplicates=0):
+            ...
+    """
+
+    def __init__(self, max_queries: int, max_duplicates: Optional[int] = None):
+        self.max_queries = max_queries
+        self.max_duplicates = max_duplicates
+        self.recorder = QueryRecorder()
+
+    def __enter__(self) -> QueryRecorder:
+        install_on_open_connections()
+        self._token = _current_recorder.set(self.recorder)
+        return self.recorder
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_recorder.reset(self._token)
+        if exc_type is None:
+            self.check()
+
+    async def __aenter__(self) -> QueryRecorder:
+        # 非同期ORMのクエリは sync_to_async のスレッドで実行されるため、そこにも入れる
+        await sync_to_async(install_on_open_connections)()
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.__exit__(exc_type, exc, tb)
+
+    def check(self) -> None:
+        problems: List[str] = []
+        if self.recorder.count > self.max_queries:
+            problems.append(f"expected at most {self.max_queries} queries")
+        if self.max_duplicates is not None and (
+            self.recorder.duplicate_count > self.max_duplicates
+        ):
+            problems.append(f"expected at most {self.max_duplicates} duplicated queries")
+        if problems:
+            raise QueryBudgetExceeded(f"{', '.join(problems)}; got {self.recorder.report()}")
+
+
+class QueryBudgetMiddleware:
+    """Record the SQL issued by each request and enforce per-route query budgets."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = {
+            "ENABLED": False,
+            "DEFAULT": 50,
+            "ROUTES": {},
+            "RAISE": False,
+            **getattr(settings, "QUERY_BUDGET", {}),
+        }
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.config["ENABLED"]:
+            return self.get_response(request)
+
+        install_on_open_connections()
+        with recording() as recorder:
+            response = self.get_response(request)
+        return self.finish(request, response, recorder)
+
+    async def __acall__(self, request):
+        if not self.config["ENABLED"]:
+            return await self.get_response(request)
+
+        await ainstall_on_open_connections()
+        with recording() as recorder:
+            response = await self.get_response(request)
+        return self.finish(request, response, recorder)
+
+    def budget_for(self, request) -> int:
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else None
+        return self.config["ROUTES"].get(view_name, self.config["DEFAULT"])
+
+    def finish(self, request, response, recorder: QueryRecorder):
+        response["X-Query-Count"] = str(recorder.count)
+        response["X-Query-Time-Ms"] = f"{recorder.duration * 1000:.1f}"
+        response["X-Query-Duplicates"] = str(recorder.duplicate_count)
+
+        budget = self.budget_for(request)
+        if recorder.count > budget:
+            message = f"{request.method} {request.path} exceeded its query budget ({budget}): "
+            if self.config["RAISE"]:
+                raise QueryBudgetExceeded(message + recorder.report())
+            logger.warning("%s%s", message, recorder.report())
+        return response
@@ -0,0 +1,176 @@
+"""
+Shared response cache for read-heavy endpoints, with version-stamped invalidation.
+
+Responses are stored in the ``default`` cache (see ``CACHES`` in settings)
+under a key made of:
+
+- the namespace's current version stamp (``items``, ``books``, ``todos`` ...)
+- the request path and its sorted query parameters
+- the authenticated user's id (responses are never shared between users)
+
+Invalidation never deletes entries: ``bump_version(namespace)`` stores a new
+stamp, so every key built afterwards is different and the old entries
+simply expire. The apps call it from ``post_save`` receivers on their
+models and after every delete (there are no ``post_delete`` receivers, so
+deletes stay a single ``DELETE``), which makes invalidation O(1) no matter
+how many pages, filters or users were cached.
+
+- ``cache_response(namespace)`` caches the rendered JSON of a Ninja
+  operation. The lookup happens after authentication (the endpoint function
+  is wrapped), and the body is stored after Ninja has serialized it.
+- ``cache_view(namespace)`` does the same for Django function views and,
+  through ``method_decorator``, class-based views.
+
+Only ``200`` responses are stored, and never ones that set cookies, used a
+CSRF token, or were rendered while flash messages were pending. A stored
+``ETag`` is replayed on hits, and a matching ``If-None-Match`` gets a 304.
+"""
+
+import functools
+import hashlib
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from ninja.decorators import decorate_view
+
+VERSION_KEY = "response-cache:version:{namespace}"
+
+
+def _version_key(namespace: str) -> str:
+    return VERSION_KEY.format(namespace=namespace)
+
+
+def bump_version(namespace: str) -> None:
+    """Invalidate every cached response of ``namespace``."""
+    cache.set(_version_key(namespace), uuid.uuid4().hex, None)
+
+
+async def abump_version(namespace: str) -> None:
+    await cache.aset(_version_key(namespace), uuid.uuid4().hex, None)
+
+
+def _response_key(namespace: str, version: Optional[str], request) -> str:
+    query = sorted(request.GET.lists())
+    digest = hashlib.sha256(f"{request.path}?{query}".encode()).hexdigest()
+    user = getattr(request, "user", None)
+    user_id = user.pk if user is not None and user.is_authenticated else "anon"
+    return f"response-cache:{namespace}:{version or 0}:{user_id}:{digest}"
+
+
+def response_key(namespace: str, request) -> str:
+    return _response_key(namespace, cache.get(_version_key(namespace)), request)
+
+
+async def aresponse_key(namespace: str, request) -> str:
+    return _response_key(namespace, await cache.aget(_version_key(namespace)), request)
+
+
+def _is_cacheable(request, response) -> bool:
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        # テンプレートで {% csrf_token %} を使ったレスポンスはセッションごとに違う
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+    )
+
+
+def _to_entry(response) -> Dict[str, Any]:
+    return {
+        "content": response.content,
+        "content_type": response["Content-Type"],
+        "etag": response.get("ETag"),
+    }
+
+
+def _from_entry(request, entry: Dict[str, Any]) -> HttpResponse:
+    etag = entry.get("etag")
+    response = etag and get_conditional_response(request, etag=etag)
+    if not response:
+        response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    if etag:
+        response["ETag"] = etag
+    response["X-Cache"] = "HIT"
+    return response
+
+
+def _timeout(timeout: Optional[int]) -> int:
+    return settings.RESPONSE_CACHE_TIMEOUT if timeout is None else timeout
+
+
+def cache_response(namespace: str, timeout: Optional[int] = None, condition: Callable = None):
+    """
+    Cache a Ninja operation's serialized response; place it below ``@router.get``.
+
+    ``condition`` receives the same arguments as the endpoint and can return
+    False to skip the cache for that request (e.g. deep pagination offsets).
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def lookup(request, *args, **kwargs):
+            if condition is not None and not condition(request, *args, **kwargs):
+                return await func(request, *args, **kwargs)
+            key = await aresponse_key(namespace, request)
+            entry = await cache.aget(key)
+            if entry is not None:
+                # HttpResponse はそのまま返されるので、スキーマ検証・シリアライズも省ける
+                return _from_entry(request, entry)
+            request._response_cache_key = key
+            return await func(request, *args, **kwargs)
+
+        def store(run):
+            @functools.wraps(run)
+            async def wrapper(request, *args, **kwargs):
+                response = await run(request, *args, **kwargs)
+                key = getattr(request, "_response_cache_key", None)
+                if key is not None and _is_cacheable(request, response):
+                    await cache.aset(key, _to_entry(response), _timeout(timeout))
+                return response
+
+            return wrapper
+
+        return decorate_view(store)(lookup)
+
+    return decorator
+
+
+def cache_view(namespace: str, timeout: Optional[int] = None):
+    """Cache a Django view's response per user, path and query string (GET only)."""
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            raise TypeError("cache_view supports sync views only; use cache_response for Ninja")
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            # 表示待ちのメッセージがある場合は、それを含むページを使い回さない
+            if request.method != "GET" or len(get_messages(request)):
+                return view(request, *args, **kwargs)
+
+            key = response_key(namespace, request)
+            entry = cache.get(key)
+            if entry is not None:
+                return _from_entry(request, entry)
+
+            response = view(request, *args, **kwargs)
+
+            def store(response):
+                if _is_cacheable(request, response):
+                    cache.set(key, _to_entry(response), _timeout(timeout))
+
+            if getattr(response, "is_rendered", True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,193 @@
+"""
+Server-Timing headers and per-route latency histograms for the Ninja API.
+
+``ServerTimingMiddleware`` times every request under ``API_METRICS["PATH_PREFIX"]``
+and adds a ``Server-Timing`` header:
+
+- ``auth``: JWT authentication (``AsyncJWTAuthWithCookie`` wraps itself in
+  ``timed("auth")``)
+- ``db``: time spent executing SQL, read from the request's SQL recorder
+  (``myproject.query_budget.recording``; queries issued during auth are
+  counted here as well)
+- ``serialize``: from the moment the operation returns (marked by the
+  ``mark_handler_done`` API decorator) until the response reaches the
+  middleware, i.e. response schema validation and JSON rendering
+- ``total``: the whole request below the middleware
+
+The total is also recorded in ``latency_registry`` keyed by (route pattern,
+method, status) and served in Prometheus text format by ``metrics_view``.
+
+When ``API_METRICS["ENABLED"]`` is false the middleware passes requests
+straight through and ``timed`` costs one ContextVar lookup.
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from .latency import LatencyRegistry
+from .query_budget import (
+    QueryRecorder,
+    ainstall_on_open_connections,
+    install_on_open_connections,
+    recording,
+)
+
+_current_timing: ContextVar[Optional["RequestTiming"]] = ContextVar("request_timing", default=None)
+
+latency_registry = LatencyRegistry()
+
+
+def api_metrics_config() -> Dict:
+    return {
+        "ENABLED": False,
+        "PATH_PREFIX": "/api/",
+        "TOKEN": "",
+        **getattr(settings, "API_METRICS", {}),
+    }
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.handler_done: Optional[float] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def header(self, finished: float) -> str:
+        phases = dict(self.phases)
+        if self.handler_done is not None:
+            phases["serialize"] = finished - self.handler_done
+        phases["total"] = finished - self.started
+        return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases.items())
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the duration of the block to ``phase`` of the current request, if timed."""
+    timing = _current_timing.get()
+    if timing is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(phase, time.perf_counter() - started)
+
+
+def mark_handler_done(func):
+    """Ninja operation decorator: remember when the endpoint function returned."""
+
+    if iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _mark_handler_done()
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _mark_handler_done()
+
+    return wrapper
+
+
+def _mark_handler_done() -> None:
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.handler_done = time.perf_counter()
+
+
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = api_metrics_config()
+        self.enabled = config["ENABLED"]
+        self.path_prefix = config["PATH_PREFIX"]
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled or not request.path.startswith(self.path_prefix):
+            return self.get_response(request)
+
+        install_on_open_connections()
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        try:
+            with recording() as recorder:
+                sql_before = recorder.duration
+                response = self.get_response(request)
+        finally:
+            _current_timing.reset(token)
+        return self.finish(request, response, timing, recorder, sql_before)
+
+    async def __acall__(self, request):
+        if not self.enabled or not request.path.startswith(self.path_prefix):
+            return await self.get_response(request)
+
+        await ainstall_on_open_connections()
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        try:
+            with recording() as recorder:
+                sql_before = recorder.duration
+                response = await self.get_response(request)
+        finally:
+            _current_timing.reset(token)
+        return self.finish(request, response, timing, recorder, sql_before)
+
+    def finish(
+        self,
+        request,
+        response,
+        timing: RequestTiming,
+        recorder: QueryRecorder,
+        sql_before: float,
+    ):
+        finished = time.perf_counter()
+        # SQL の時間は QueryBudgetMiddleware と共有の記録から取る（クエリごとの計測は1回）
+        if recorder.duration > sql_before:
+            timing.add("db", recorder.duration - sql_before)
+        response["Server-Timing"] = timing.header(finished)
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match else "<unmatched>"
+        latency_registry.record(
+            route, request.method, response.status_code, finished - timing.started
+        )
+        return response
+
+
+def metrics_view(request):
+    """Latency histograms in Prometheus text exposition format."""
+    config = api_metrics_config()
+    if not config["ENABLED"]:
+        raise Http404
+    if config["TOKEN"] and request.headers.get("Authorization") != f"Bearer {config['TOKEN']}":
+        return HttpResponse(status=401)
+    return HttpResponse(
+        latency_registry.render_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
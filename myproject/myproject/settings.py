@@ -68,6 +68,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "myproject.server_timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -75,6 +76,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "myproject.query_budget.QueryBudgetMiddleware",
 ]
 
 ROOT_URLCONF = "myproject.urls"
@@ -102,6 +104,32 @@ WSGI_APPLICATION = "myproject.wsgi.application"
 
 DATABASES = {"default": dj_database_url.config(default="sqlite:///db.sqlite3")}
 
+# ---- Database connection pooling ----
+# PostgreSQL では psycopg3 のコネクションプールを使い、リクエストごとの接続確立をなくす。
+# 接続はプールから借りて、リクエスト終了時にプールへ返す（CONN_MAX_AGE とは併用できない）
+# プールを使わない場合（DB_POOL_ENABLED=false や SQLite）は永続接続（DB_CONN_MAX_AGE 秒）+
+# ヘルスチェックにフォールバックする
+DB_POOL_ENABLED = os.environ.get("DB_POOL_ENABLED", "true").lower() == "true"
+if DB_POOL_ENABLED and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        # プロセスごとに保持する接続数（最小/最大）
+        "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+        # 空き接続を待つ最大秒数（超えると PoolTimeout）
+        "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),
+        # 接続を作り直すまでの最大秒数と、使われない接続を閉じるまでの秒数
+        "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", "1800")),
+        "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "300")),
+        # 貸し出す前に接続が生きているか確認する（DB再起動後の切断対策）
+        "check": ConnectionPool.check_connection,
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.environ.get("DB_CONN_MAX_AGE", "60"))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -154,6 +182,83 @@ NINJA_JWT = {
     "AUTH_COOKIE_SAMESITE": "Lax",
 }
 
+# ---- Cache ----
+# CACHE_BACKEND: locmem（開発時の既定、プロセスごと）/ file（CACHE_LOCATION のディレクトリ）/
+# redis（本番の既定、CACHE_LOCATION の Redis 互換サーバー）
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "redis" if IS_PRODUCTION else "locmem")
+# 本番は複数ワーカー（gunicorn.conf.py）で動く。locmem だと書き込み時の無効化
+# （response_cache のバージョン、items の件数キャッシュ）が他のワーカーに届かず、
+# 古いレスポンスが RESPONSE_CACHE_TIMEOUT の間返され続けるため、共有キャッシュを必須にする
+if IS_PRODUCTION and CACHE_BACKEND == "locmem":
+    raise ValueError("Production requires a shared cache: set CACHE_BACKEND=redis (or file)")
+CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "myproject",
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("CACHE_LOCATION", str(BASE_DIR / ".cache")),
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("CACHE_LOCATION", "redis://localhost:6379/0"),
+    },
+}
+CACHES = {
+    "default": {
+        **CACHE_BACKENDS[CACHE_BACKEND],
+        "KEY_PREFIX": os.environ.get("CACHE_KEY_PREFIX", "myproject"),
+    },
+}
+# cache_response / cache_view (myproject.response_cache) でレスポンスを保持する秒数
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("RESPONSE_CACHE_TIMEOUT", "300"))
+
+# ---- Login password hashing (myproject.password_hashing) ----
+# 同時に実行するハッシュ計算の数と、実行中+待機中のログインの上限（超えたら 503）
+LOGIN_HASH_WORKERS = int(os.environ.get("LOGIN_HASH_WORKERS", "2"))
+LOGIN_HASH_MAX_PENDING = int(os.environ.get("LOGIN_HASH_MAX_PENDING", "32"))
+
+# ---- Verified JWT cache (myproject.token_cache) ----
+# 検証済みアクセストークンを保持する件数（0 で無効）と最大保持秒数
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", "1024"))
+AUTH_TOKEN_CACHE_TTL = int(os.environ.get("AUTH_TOKEN_CACHE_TTL", "60"))
+
+# ---- Items API ----
+# count=cached の時に COUNT(*) の結果を再利用する秒数
+ITEMS_COUNT_CACHE_TTL = int(os.environ.get("ITEMS_COUNT_CACHE_TTL", "60"))
+
+# ---- Todo analytics chart cache (todoapp.charts) ----
+# 描画済みPNGをプロセス内に保持する合計バイト数の上限
+TODO_CHART_CACHE_BYTES = int(os.environ.get("TODO_CHART_CACHE_BYTES", str(16 * 1024 * 1024)))
+# 描画用プロセスプールのワーカー数（0 でリクエストのスレッド内で描画）と、待機+実行中の上限
+TODO_CHART_RENDER_WORKERS = int(os.environ.get("TODO_CHART_RENDER_WORKERS", "2"))
+TODO_CHART_RENDER_MAX_PENDING = int(os.environ.get("TODO_CHART_RENDER_MAX_PENDING", "8"))
+
+# ---- Query budget (myproject.query_budget) ----
+# リクエストごとのクエリ数・SQL時間・重複SQLを計測し、X-Query-* ヘッダーで返す（既定は開発環境のみ）
+# ROUTES は URL名ごとのクエリ数の上限。超えたら警告ログ（RAISE=True なら例外）
+QUERY_BUDGET = {
+    "ENABLED": os.environ.get("QUERY_BUDGET_ENABLED", str(DEBUG)).lower() == "true",
+    "DEFAULT": int(os.environ.get("QUERY_BUDGET_DEFAULT", "20")),
+    "RAISE": os.environ.get("QUERY_BUDGET_RAISE", "false").lower() == "true",
+    "ROUTES": {
+        "students_by_class": 4,
+        "students_join_profile": 3,
+        "todo_list": 5,
+    },
+}
+
+# ---- API metrics (myproject.server_timing) ----
+# /api/ 配下のリクエストに Server-Timing ヘッダーを付け、ルート別のレイテンシを
+# ヒストグラムに記録して /metrics で Prometheus 形式で返す。
+# METRICS_TOKEN を設定すると /metrics に "Authorization: Bearer <token>" が必要になる
+API_METRICS = {
+    "ENABLED": os.environ.get("API_METRICS_ENABLED", "false").lower() == "true",
+    "PATH_PREFIX": "/api/",
+    "TOKEN": os.environ.get("API_METRICS_TOKEN", ""),
+}
+
 # ---- CORS Configuration ----
 CORS_ALLOW_CREDENTIALS = True
 
@@ -0,0 +1,59 @@
+"""
+Sparse fieldsets: a ``fields=`` query parameter that narrows a response.
+
+``GET /api/items?fields=id,name`` returns only ``id`` and ``name`` for each
+item, and only those columns are read from the database. Endpoints use two
+helpers:
+
+- ``parse_fields(value, schema)`` validates the parameter against the
+  schema and returns the field names in schema order (so ``name,id`` and
+  ``id,name`` are the same field set), or ``None`` when it was omitted.
+- ``partial_schema(schema, fields)`` returns a schema with just those
+  fields. The classes are generated with pydantic's ``create_model`` once
+  per field set and cached (the number of sets is bounded by the LRU
+  size), so a request never builds a model class.
+
+The SQL side uses the same names: pass the partial schema to
+``afetch_rows`` (``values()``), or the field names to ``only()`` and
+validate the instances with the partial schema. Only schemas that pass
+``schema_fields`` (every field a plain model column) can be narrowed.
+"""
+
+import functools
+from typing import Optional, Tuple, Type
+
+from ninja import Schema
+from pydantic import create_model
+
+from .values_rows import schema_fields
+
+PARTIAL_SCHEMA_CACHE_SIZE = 256
+
+
+class InvalidFields(ValueError):
+    """Raised when ``fields=`` names a field the schema does not have."""
+
+
+def parse_fields(value: Optional[str], schema: Type[Schema]) -> Optional[Tuple[str, ...]]:
+    if value is None:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    available = schema_fields(schema)
+    unknown = requested.difference(available)
+    if unknown or not requested:
+        raise InvalidFields(
+            f"Unknown fields: {', '.join(sorted(unknown)) or '(none given)'}; "
+            f"available: {', '.join(available)}"
+        )
+    return tuple(name for name in available if name in requested)
+
+
+@functools.lru_cache(maxsize=PARTIAL_SCHEMA_CACHE_SIZE)
+def partial_schema(schema: Type[Schema], fields: Tuple[str, ...]) -> Type[Schema]:
+    """``schema`` narrowed to ``fields`` (as returned by ``parse_fields``)."""
+    if fields == schema_fields(schema):
+        return schema
+    definitions = {
+        name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields
+    }
+    return create_model(f"{schema.__name__}[{','.join(fields)}]", __base__=Schema, **definitions)
@@ -1,6 +1,11 @@
+import asyncio
+import threading
+import time
+
 import pytest
 from ninja.testing import TestClient
 
+from myproject.password_hashing import HashingOverloaded, PasswordHashingPool, hashing_pool
 from myproject.urls import api
 
 
@@ -35,3 +40,86 @@ def test_logout_is_idempotent(sync_client):
     response = sync_client.post("/auth/logout")
     assert response.status_code == 200
     assert response.json()["message"] == "Logged out"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_login_sets_cookie(async_client, user):
+    """Test that login with valid credentials sets the access_token cookie"""
+    response = await async_client.post(
+        "/auth/login", json={"username": "testuser", "password": "testpass123"}
+    )
+    assert response.status_code == 200
+    assert response.json()["message"] == "Login successful"
+    assert response.cookies["access_token"].value
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "username, password",
+    [
+        ("testuser", "wrong-password"),  # パスワード違い
+        ("nobody", "testpass123"),  # 存在しないユーザー
+    ],
+)
+async def test_login_invalid_credentials(async_client, user, username, password):
+    response = await async_client.post(
+        "/auth/login", json={"username": username, "password": password}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_login_inactive_user(async_client, user):
+    user.is_active = False
+    await user.asave()
+
+    response = await async_client.post(
+        "/auth/login", json={"username": "testuser", "password": "testpass123"}
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_login_rejects_when_hashing_pool_is_full(async_client, user, monkeypatch):
+    """ハッシュ計算の待ち行列が満杯なら、待たずに 503 を返す"""
+    monkeypatch.setattr(hashing_pool, "max_pending", 0)
+
+    response = await async_client.post(
+        "/auth/login", json={"username": "testuser", "password": "testpass123"}
+    )
+    assert response.status_code == 503
+    assert response["Retry-After"] == "1"
+
+
+def test_hashing_pool_limit_holds_across_event_loops():
+    """WSGI では各リクエストが別スレッドのイベントループで動く。その場合も上限を守る"""
+    pool = PasswordHashingPool(max_workers=2, max_pending=2)
+    release = threading.Event()
+    outcomes = []
+
+    def login():
+        try:
+            asyncio.run(pool.run(release.wait, 5))
+            outcomes.append("ok")
+        except HashingOverloaded:
+            outcomes.append("rejected")
+
+    threads = [threading.Thread(target=login) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while outcomes.count("rejected") < 6 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.pending == 2
+
+    release.set()
+    for thread in threads:
+        thread.join()
+    pool.executor.shutdown()
+
+    assert sorted(outcomes) == ["ok", "ok"] + ["rejected"] * 6
+    assert pool.pending == 0
@@ -0,0 +1,73 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from django.core.serializers.json import DjangoJSONEncoder
+
+from items.models import Item
+from myproject.fast_json import BACKENDS, FastJSONParser, FastJSONRenderer
+
+pytest.importorskip("orjson")
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    return request.param
+
+
+def test_backends_render_the_same_values(backend):
+    moment = datetime.datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)
+    data = {
+        "name": "りんご",
+        "price": Decimal("1.50"),
+        "uuid": uuid.UUID(int=1),
+        "at": moment,
+        "day": moment.date(),
+        "counts": {1: 2},
+    }
+
+    content = FastJSONRenderer(backend).render(None, data, response_status=200)
+
+    assert json.loads(content) == {
+        "name": "りんご",
+        "price": "1.50",
+        "uuid": "00000000-0000-0000-0000-000000000001",
+        # 日時は Django の表記（ミリ秒・UTC は Z）に揃える
+        "at": DjangoJSONEncoder().default(moment),
+        "day": "2026-01-02",
+        "counts": {"1": 2},
+    }
+
+
+def test_unsupported_type_raises(backend):
+    with pytest.raises(TypeError):
+        FastJSONRenderer(backend).render(None, {"value": object()}, response_status=200)
+
+
+def test_parser_backends_agree(backend):
+    request = SimpleNamespace(body='{"name": "りんご", "price": 100}'.encode())
+    assert FastJSONParser(backend).parse_body(request) == {"name": "りんご", "price": 100}
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+        FastJSONRenderer("ujson")
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_api_renders_and_parses_with_fast_json(async_client, auth_headers):
+    await Item.objects.acreate(name="りんご", price=100)
+
+    response = await async_client.get("/items", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/json; charset=utf-8"
+    assert response.json()["items"][0]["name"] == "りんご"
+
+    response = await async_client.post(
+        "/items", data='{"name": "みかん"', content_type="application/json", headers=auth_headers
+    )
+    assert response.status_code == 400
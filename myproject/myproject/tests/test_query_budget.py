@@ -0,0 +1,70 @@
+import logging
+
+import pytest
+from django.test import AsyncClient, Client
+
+from items.models import Item
+from myproject.query_budget import QueryBudgetExceeded, normalize_sql
+
+
+@pytest.fixture
+def budget_settings(settings):
+    settings.QUERY_BUDGET = {"ENABLED": True, "DEFAULT": 50, "ROUTES": {}, "RAISE": False}
+    return settings.QUERY_BUDGET
+
+
+def test_normalize_sql_ignores_literals_and_in_lists():
+    a = normalize_sql('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) LIMIT 21')
+    b = normalize_sql('SELECT * FROM "t" WHERE "id" IN (%s, %s) LIMIT 5')
+    assert a == b
+    assert normalize_sql("SELECT 'abc'") == normalize_sql("SELECT 'x''y'")
+
+
+@pytest.mark.django_db
+def test_sync_view_reports_query_headers(budget_settings):
+    response = Client().get("/exe02/educationapp/student_list/")
+
+    assert response.status_code == 200
+    assert int(response["X-Query-Count"]) >= 1
+    assert float(response["X-Query-Time-Ms"]) >= 0
+    assert response["X-Query-Duplicates"] == "0"
+
+
+@pytest.mark.django_db
+def test_over_budget_logs_warning(budget_settings, caplog):
+    budget_settings["ROUTES"] = {"student_list": 0}
+
+    with caplog.at_level(logging.WARNING, logger="myproject.query_budget"):
+        response = Client().get("/exe02/educationapp/student_list/")
+
+    assert response.status_code == 200
+    assert "exceeded its query budget (0)" in caplog.text
+
+
+@pytest.mark.django_db
+def test_over_budget_raises_when_configured(budget_settings):
+    budget_settings.update(ROUTES={"student_list": 0}, RAISE=True)
+
+    with pytest.raises(QueryBudgetExceeded):
+        Client().get("/exe02/educationapp/student_list/")
+
+
+@pytest.mark.django_db
+def test_disabled_by_default_outside_debug(settings):
+    settings.QUERY_BUDGET = {"ENABLED": False}
+
+    response = Client().get("/exe02/educationapp/student_list/")
+
+    assert "X-Query-Count" not in response
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_async_api_reports_query_headers(budget_settings, auth_headers):
+    await Item.objects.acreate(name="Item", price=100)
+
+    response = await AsyncClient().get("/api/items", headers=auth_headers)
+
+    assert response.status_code == 200
+    # 認証 1 + 件数 1 + 一覧 1
+    assert response["X-Query-Count"] == "3"
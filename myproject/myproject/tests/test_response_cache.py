@@ -0,0 +1,170 @@
+import os
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+from django.test import Client
+
+from bookapp.models import Book
+from items.models import Item
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_get_item_served_from_cache(async_client, auth_headers, query_budget):
+    item = await Item.objects.acreate(name="りんご", price=100)
+
+    response = await async_client.get(f"/items/{item.id}", headers=auth_headers)
+    assert response.status_code == 200
+
+    # 2回目は認証（検証済みトークン）もレスポンスもキャッシュから返り、クエリを発行しない
+    async with query_budget(0):
+        response = await async_client.get(f"/items/{item.id}", headers=auth_headers)
+    assert response.json()["name"] == "りんご"
+    assert response["X-Cache"] == "HIT"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_write_invalidates_cached_responses(async_client, auth_headers):
+    item = await Item.objects.acreate(name="りんご", price=100)
+    await async_client.get(f"/items/{item.id}", headers=auth_headers)
+    await async_client.get("/items", headers=auth_headers)
+
+    await async_client.put(
+        f"/items/{item.id}",
+        json={"name": "みかん", "price": 80, "version": item.version},
+        headers=auth_headers,
+    )
+
+    response = await async_client.get(f"/items/{item.id}", headers=auth_headers)
+    assert response.json()["name"] == "みかん"
+    response = await async_client.get("/items", headers=auth_headers)
+    assert response.json()["items"][0]["name"] == "みかん"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_delete_invalidates_cached_responses(async_client, auth_headers):
+    item = await Item.objects.acreate(name="りんご", price=100)
+    await async_client.get(f"/items/{item.id}", headers=auth_headers)
+    await async_client.get("/items", headers=auth_headers)
+
+    await async_client.delete(f"/items/{item.id}", headers=auth_headers)
+
+    response = await async_client.get(f"/items/{item.id}", headers=auth_headers)
+    assert response.status_code == 404
+    response = await async_client.get("/items", headers=auth_headers)
+    assert response.json()["count"] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_bulk_create_invalidates_list(async_client, auth_headers):
+    await async_client.get("/items", headers=auth_headers)
+
+    await async_client.post(
+        "/items/bulk", json=[{"name": "りんご", "price": 100}], headers=auth_headers
+    )
+
+    response = await async_client.get("/items", headers=auth_headers)
+    assert response.json()["count"] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_list_cache_keys_on_query_params(async_client, auth_headers):
+    for i in range(3):
+        await Item.objects.acreate(name=f"Item {i}", price=100)
+
+    first = await async_client.get("/items?limit=1", headers=auth_headers)
+    second = await async_client.get("/items?limit=2", headers=auth_headers)
+    assert len(first.json()["items"]) == 1
+    assert len(second.json()["items"]) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_deep_list_pages_are_not_cached(async_client, auth_headers):
+    await async_client.get("/items?offset=500", headers=auth_headers)
+
+    response = await async_client.get("/items?offset=500", headers=auth_headers)
+    assert "X-Cache" not in response.headers
+
+
+@pytest.fixture
+def book_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def create_book(title):
+    return Book.objects.create(title=title, author="著者", publication_date=date(2026, 4, 1))
+
+
+@pytest.mark.django_db
+def test_book_list_cached_until_book_changes(book_client):
+    create_book("一冊目")
+    assert "一冊目" in book_client.get("/exe02/").content.decode()
+
+    response = book_client.get("/exe02/")
+    assert response["X-Cache"] == "HIT"
+
+    create_book("二冊目")
+    response = book_client.get("/exe02/")
+    assert "X-Cache" not in response.headers
+    assert "二冊目" in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_cached_pages_are_per_user(book_client, django_user_model):
+    create_book("一冊目")
+    book_client.get("/exe02/")
+
+    other = Client()
+    other.force_login(django_user_model.objects.create_user(username="other", password="x"))
+    assert "X-Cache" not in other.get("/exe02/")
+
+
+@pytest.mark.django_db
+def test_page_with_pending_messages_is_not_cached(book_client):
+    create_book("一冊目")
+    book_client.get("/exe02/messages/", follow=False)
+
+    assert "これは成功メッセージです。" in book_client.get("/exe02/").content.decode()
+
+    # メッセージ入りのページは保存されないので、次の表示にメッセージは残らない
+    response = book_client.get("/exe02/")
+    assert "X-Cache" not in response
+    assert "これは成功メッセージです。" not in response.content.decode()
+
+
+def _production_cache_backend(**env):
+    """Output of loading the production settings: CACHES, or the error raised at startup"""
+    result = subprocess.run(
+        [sys.executable, "-c", "from myproject import settings; print(settings.CACHES)"],
+        cwd=BASE_DIR,
+        env={
+            **{key: value for key, value in os.environ.items() if key != "CACHE_BACKEND"},
+            "DJANGO_ENV": "production",
+            "DJANGO_SECRET_KEY": "x",
+            "DJANGO_ALLOWED_HOSTS": "example.com",
+            "CORS_ORIGINS": "https://example.com",
+            "CSRF_TRUSTED_ORIGINS": "https://example.com",
+            **env,
+        },
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout + result.stderr
+
+
+def test_production_requires_shared_cache():
+    # ワーカーごとの locmem では書き込みの無効化が他のワーカーに届かない
+    assert "set CACHE_BACKEND=redis" in _production_cache_backend(CACHE_BACKEND="locmem")
+    assert "RedisCache" in _production_cache_backend()
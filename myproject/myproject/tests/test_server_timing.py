@@ -0,0 +1,106 @@
+import re
+
+import pytest
+from django.db import connections
+from django.test import AsyncClient, Client
+
+from items.models import Item
+from myproject.latency import LatencyHistogram, bucket_index, bucket_upper_bound
+from myproject.query_budget import _record_query
+from myproject.server_timing import latency_registry
+
+
+@pytest.fixture
+def metrics_enabled(settings):
+    settings.API_METRICS = {"ENABLED": True, "PATH_PREFIX": "/api/", "TOKEN": ""}
+    latency_registry.clear()
+    yield settings.API_METRICS
+    latency_registry.clear()
+
+
+def server_timing(response):
+    return {
+        name: float(duration)
+        for name, duration in re.findall(r"(\w+);dur=([\d.]+)", response["Server-Timing"])
+    }
+
+
+@pytest.mark.parametrize("micros", [0, 7, 8, 100, 1023, 1024, 1_500_000])
+def test_bucket_holds_value_within_precision(micros):
+    upper = bucket_upper_bound(bucket_index(micros))
+    assert micros <= upper <= micros * 1.125 + 1
+
+
+def test_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 100
+    assert histogram.percentile(50) == pytest.approx(0.050, rel=0.125)
+    assert histogram.percentile(99) == pytest.approx(0.099, rel=0.125)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_api_response_has_server_timing(metrics_enabled, auth_headers):
+    await Item.objects.acreate(name="Item", price=100)
+
+    response = await AsyncClient().get("/api/items", headers=auth_headers)
+
+    assert response.status_code == 200
+    phases = server_timing(response)
+    assert set(phases) == {"auth", "db", "serialize", "total"}
+    assert phases["total"] >= phases["serialize"]
+
+    histogram = latency_registry.get("api/items", "GET", 200)
+    assert histogram.count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_db_phase_shares_the_query_budget_recorder(metrics_enabled, settings, auth_headers):
+    settings.QUERY_BUDGET = {"ENABLED": True, "DEFAULT": 50, "ROUTES": {}, "RAISE": False}
+
+    # 同期クライアントなら ORM はこのスレッドの接続を使う
+    response = Client().get("/api/items", headers=auth_headers)
+
+    # 両方のミドルウェアが同じ記録を読み、接続ごとの execute wrapper は1つだけ
+    db_ms = server_timing(response)["db"]
+    assert float(response["X-Query-Time-Ms"]) == pytest.approx(db_ms, abs=0.1)
+    for connection in connections.all(initialized_only=True):
+        assert connection.execute_wrappers == [_record_query]
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_exports_prometheus_text(metrics_enabled):
+    client = Client()
+    client.post("/api/auth/logout")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    assert "# TYPE api_request_duration_seconds histogram" in body
+    labels = 'route="api/auth/logout",method="POST",status="200"'
+    assert f'api_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in body
+    assert f"api_request_duration_seconds_count{{{labels}}} 1" in body
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_token_when_configured(metrics_enabled):
+    metrics_enabled["TOKEN"] = "secret"
+
+    assert Client().get("/metrics").status_code == 401
+    response = Client().get("/metrics", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_disabled_adds_nothing(settings):
+    settings.API_METRICS = {"ENABLED": False}
+
+    response = Client().post("/api/auth/logout")
+
+    assert "Server-Timing" not in response
+    assert Client().get("/metrics").status_code == 404
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from todoapp.rendering import LAZY_MODULES
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+def test_startup_does_not_import_analytics_libraries():
+    """Workers and manage.py commands must not pay for matplotlib / pandas at startup"""
+    # このテストプロセスでは他のテストが既に読み込んでいるので、新しいプロセスで確かめる
+    code = (
+        "import sys, django; django.setup(); import myproject.urls; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BASE_DIR,
+        env={"DJANGO_SETTINGS_MODULE": "myproject.settings", **os.environ},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+from django.contrib.auth.models import User
+
+from myproject.token_cache import VerifiedTokenCache, verified_tokens
+
+
+def test_entry_expires_at_token_exp():
+    cache = VerifiedTokenCache(max_size=10, ttl=60)
+    user = User(pk=1)
+
+    cache.set("expired", user, exp=time.time() - 1)
+    cache.set("valid", user, exp=time.time() + 30)
+
+    assert cache.get("expired") is None
+    assert cache.get("valid") is user
+
+
+def test_lru_eviction():
+    cache = VerifiedTokenCache(max_size=2, ttl=60)
+    exp = time.time() + 60
+    cache.set("a", User(pk=1), exp)
+    cache.set("b", User(pk=2), exp)
+    cache.get("a")  # a を最近使用したことにする
+    cache.set("c", User(pk=3), exp)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_disabled_when_size_is_zero():
+    cache = VerifiedTokenCache(max_size=0, ttl=60)
+    cache.set("a", User(pk=1), time.time() + 60)
+    assert cache.get("a") is None
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_repeat_request_skips_user_lookup(async_client, auth_headers, user):
+    """2回目以降はキャッシュから認証され、DB上のユーザーを参照しない"""
+    response = await async_client.get("/items", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(verified_tokens) == 1
+
+    # シグナルを送らずに無効化 → キャッシュが使われていれば認証は通る
+    await User.objects.filter(pk=user.pk).aupdate(is_active=False)
+    response = await async_client.get("/items", headers=auth_headers)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_deactivating_user_invalidates_cache(async_client, auth_headers, user):
+    response = await async_client.get("/items", headers=auth_headers)
+    assert response.status_code == 200
+
+    user.is_active = False
+    await user.asave()
+    assert len(verified_tokens) == 0
+
+    response = await async_client.get("/items", headers=auth_headers)
+    assert response.status_code == 401
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from ninja import Field, Schema
+
+from items.models import Item
+from items.schemas import ItemSchema
+from myproject.values_rows import afetch_rows, render_json, schema_fields
+
+
+class ResolvedSchema(Schema):
+    id: int
+    label: str
+
+    @staticmethod
+    def resolve_label(obj):
+        return f"#{obj.id}"
+
+
+class AliasedSchema(Schema):
+    id: int
+    title: str = Field(alias="name")
+
+
+def test_schema_fields_follow_schema_order():
+    assert schema_fields(ItemSchema) == ("id", "name", "price", "version")
+
+
+@pytest.mark.parametrize("schema", [ResolvedSchema, AliasedSchema])
+def test_schema_fields_reject_computed_fields(schema):
+    with pytest.raises(ImproperlyConfigured, match="not a plain model column"):
+        schema_fields(schema)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_afetch_rows_match_schema_validation(query_budget):
+    for i in range(3):
+        await Item.objects.acreate(name=f"Item {i}", price=100 + i)
+    queryset = Item.objects.order_by("id")
+
+    async with query_budget(1):
+        rows = await afetch_rows(queryset, ItemSchema, extra=("updated",))
+    assert all(row.pop("updated") for row in rows)
+
+    # モデル → スキーマ検証を経由した場合と同じ dict になる
+    expected = [ItemSchema.model_validate(item).model_dump() async for item in queryset]
+    assert rows == expected
+
+
+def test_render_json_keeps_temporal_headers():
+    response = HttpResponse("", content_type="application/json; charset=utf-8")
+    response["ETag"] = '"abc"'
+
+    rendered = render_json(response, {"items": [{"id": 1, "name": "りんご"}]})
+
+    assert rendered is response
+    assert rendered["ETag"] == '"abc"'
+    assert json.loads(rendered.content) == {"items": [{"id": 1, "name": "りんご"}]}
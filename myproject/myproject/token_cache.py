@@ -0,0 +1,97 @@
+"""
+In-process cache of already verified JWT access tokens.
+
+The SPA sends the same access token on every API call, and verifying it
+means a signature check, claim checks and a ``User`` lookup each time.
+This LRU cache remembers the resolved user per token so that a repeat
+request costs one dictionary lookup.
+
+- Keys are SHA-256 hashes of the token (the raw token is never stored).
+- Entries expire at the token's ``exp`` or after ``AUTH_TOKEN_CACHE_TTL``
+  seconds, whichever comes first.
+- At most ``AUTH_TOKEN_CACHE_SIZE`` entries are kept (0 disables the cache).
+- Deactivating or deleting a user drops all of that user's entries.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        # シグナル（同期スレッド）からも触るためロックで保護する
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Any]:
+        """Return the cached user for ``token``, or None on a miss or expiry."""
+        if not self.max_size:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return user
+
+    def set(self, token: str, user: Any, exp: float) -> None:
+        """Cache ``user`` for ``token`` until ``exp`` (a unix timestamp) at the latest."""
+        if not self.max_size:
+            return
+        key = self._key(token)
+        expires_at = min(exp, time.time() + self.ttl)
+        with self._lock:
+            self._entries[key] = (user, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        with self._lock:
+            stale = [key for key, (user, _) in self._entries.items() if user.pk == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+verified_tokens = VerifiedTokenCache(
+    max_size=settings.AUTH_TOKEN_CACHE_SIZE,
+    ttl=settings.AUTH_TOKEN_CACHE_TTL,
+)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_deactivated_user(sender, instance, **kwargs):
+    """無効化されたユーザーのキャッシュ済みトークンを破棄する"""
+    if not instance.is_active:
+        verified_tokens.invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=get_user_model())
+def invalidate_deleted_user(sender, instance, **kwargs):
+    verified_tokens.invalidate_user(instance.pk)
@@ -19,14 +19,20 @@ from items.api import router as items_router
 
 from . import views
 from .auth_api import router as auth_router
+from .fast_json import FastJSONParser, FastJSONRenderer
+from .server_timing import mark_handler_done, metrics_view
 from .test_api import router as test_router
 
 # 👇 2. ここも変更！
-api = NinjaExtraAPI()
+# JSON の出力・入力は orjson で行う（未インストールなら標準の json）
+api = NinjaExtraAPI(renderer=FastJSONRenderer(), parser=FastJSONParser())
 
 # これで register_controllers が使えるようになります！
 api.register_controllers(NinjaJWTDefaultController)
 
+# エンドポイント関数が返った時刻を記録（Server-Timing の serialize 計測用）
+api.add_decorator(mark_handler_done)
+
 # ルーター登録
 api.add_router("/items", items_router)
 api.add_router("/auth", auth_router)
@@ -44,4 +50,5 @@ urlpatterns = [
     path("exe05/", include("appendixapp.urls")),
     path("vanilla/", TemplateView.as_view(template_name="items_vanilla.html"), name="vanilla_items"),
     path("api/", api.urls),
+    path("metrics", metrics_view, name="metrics"),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,74 @@
+"""
+``values()`` fast path for read-only Ninja list endpoints.
+
+The usual path builds a model instance per row, then Ninja validates each
+instance into the response schema and dumps it back to a dict before
+rendering. For a list page that is three objects per row, two of them
+thrown away. Here the rows come straight from ``QuerySet.values()`` as
+dicts shaped like the item schema, and the response body is rendered
+from them directly:
+
+    rows = await afetch_rows(queryset, ItemSchema)
+    return render_json(response, {"items": rows, ...})
+
+``response`` is the Ninja temporal response (declare ``response:
+HttpResponse`` on the endpoint), so headers set on it are kept. Returning
+an ``HttpResponse`` makes Ninja skip response validation, which is why
+the schema has to be a flat projection of model columns: every field
+must be a column of the same name, with no aliases or ``resolve_*``
+methods (``schema_fields`` checks this). The endpoint keeps its
+``response=`` declaration, so the OpenAPI document does not change.
+"""
+
+import functools
+from typing import Any, Dict, List, Sequence, Tuple, Type
+
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from ninja import Schema
+
+from .fast_json import FastJSONRenderer
+
+# urls.py の API と同じレンダラー（テンポラリレスポンスの Content-Type もそれに合わせてある）
+_renderer = FastJSONRenderer()
+
+
+@functools.cache
+def schema_fields(schema: Type[Schema]) -> Tuple[str, ...]:
+    """Field names of ``schema``, which must map one-to-one onto model columns."""
+    resolvers = getattr(schema, "_ninja_resolvers", {})
+    for name, field in schema.model_fields.items():
+        if name in resolvers or (field.alias and field.alias != name):
+            raise ImproperlyConfigured(
+                f"{schema.__name__}.{name} is not a plain model column; "
+                "it cannot be read with values()"
+            )
+    return tuple(schema.model_fields)
+
+
+async def afetch_rows(queryset, schema: Type[Schema], extra: Sequence[str] = ()) -> List[Dict]:
+    """
+    The rows of ``queryset`` as dicts with ``schema``'s fields.
+
+    ``extra`` columns are fetched in the same query (e.g. for an ETag);
+    take them out with ``split_extra`` before rendering.
+    """
+    fields = schema_fields(schema)
+    columns = (*fields, *(name for name in extra if name not in fields))
+    return [row async for row in queryset.values(*columns)]
+
+
+def split_extra(rows: List[Dict], schema: Type[Schema], extra: Sequence[str]) -> Dict[str, List]:
+    """Each ``extra`` column's values, removed from the rows unless ``schema`` returns it."""
+    fields = schema_fields(schema)
+    columns: Dict[str, List] = {name: [] for name in extra}
+    for row in rows:
+        for name in extra:
+            columns[name].append(row[name] if name in fields else row.pop(name))
+    return columns
+
+
+def render_json(response: HttpResponse, data: Any) -> HttpResponse:
+    """Render ``data`` into Ninja's temporal ``response`` without schema validation."""
+    response.content = _renderer.render(None, data, response_status=response.status_code)
+    return response
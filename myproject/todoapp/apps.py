@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class TodoappConfig(AppConfig):
     name = "todoapp"
+
+    def ready(self):
+        from . import signals  # noqa: F401
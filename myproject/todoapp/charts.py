@@ -0,0 +1,80 @@
+"""
+タスク分析グラフ(PNG)のキャッシュ
+
+グラフの描画（todoapp.rendering）は1回あたり100ms以上のCPUを使うため、描画結果のPNGを
+(ユーザー, データの指紋) をキーにしてプロセス内にキャッシュする。
+指紋は「最新の updated + タスク数」で、タスクの作成・更新・削除で変わる。
+キャッシュはPNGの合計バイト数が TODO_CHART_CACHE_BYTES を超えると、
+最も長く使われていないものから捨てる。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from django.conf import settings
+
+from .models import Todo
+from .rendering import ChartRenderPool
+
+
+class ChartCache:
+    """PNGの合計サイズで上限を決めるLRUキャッシュ"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+            return png
+
+    def set(self, key: Hashable, png: bytes) -> None:
+        if len(png) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = png
+            self.size += len(png)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+chart_cache = ChartCache(max_bytes=settings.TODO_CHART_CACHE_BYTES)
+
+render_pool = ChartRenderPool(
+    max_workers=settings.TODO_CHART_RENDER_WORKERS,
+    max_pending=settings.TODO_CHART_RENDER_MAX_PENDING,
+)
+
+
+def get_analytics_chart(user, fingerprint) -> bytes:
+    """
+    キャッシュ済みのPNGを返す。なければ集計して描画し、キャッシュする
+
+    描画待ちが多すぎる場合は RenderPoolBusy を送出する。
+    """
+    key = (user.pk, fingerprint)
+    png = chart_cache.get(key)
+    if png is None:
+        stats = Todo.get_completion_stats(user=user)
+        daily_counts = Todo.get_daily_creation_counts(user=user, days=7)
+        png = render_pool.render(stats, daily_counts)
+        chart_cache.set(key, png)
+    return png
@@ -1,6 +1,6 @@
 from django.contrib.auth.models import User
 from django.db import models
-from django_pandas.io import read_frame
+from django.db.models.functions import TruncDate
 
 
 class Todo(models.Model):
@@ -23,14 +23,22 @@ class Todo(models.Model):
         ordering = ["-created"]
 
     @classmethod
-    def get_completion_stats(cls):
-        """完了済み、および未完了のタスクを集計して返す"""
-        # 全てのタスクを取得
+    def _completion_counts(cls, user=None):
+        """集計対象のQuerySetと、完了・未完了を1回のクエリで数える集計式を返す"""
         todos = cls.objects.all()
-        # 完了済みのタスク数をカウント
-        completed = todos.filter(completed=True).count()
-        # 未完了のタスクの数をカウント
-        not_completed = todos.filter(completed=False).count()
+        if user is not None:
+            todos = todos.filter(user=user)
+        # 別名をフィールド名(completed)と同じにすると FieldError になるため _count を付ける
+        counts = {
+            "completed_count": models.Count("pk", filter=models.Q(completed=True)),
+            "not_completed_count": models.Count("pk", filter=models.Q(completed=False)),
+        }
+        return todos, counts
+
+    @staticmethod
+    def _build_completion_stats(completed_count, not_completed_count):
+        completed = completed_count
+        not_completed = not_completed_count
         # 総タスク数
         total = completed + not_completed
 
@@ -48,9 +56,63 @@ class Todo(models.Model):
             "completion_rate": completion_rate,
         }
 
+    @classmethod
+    def get_completion_stats(cls, user=None):
+        """
+        完了済み、および未完了のタスクを集計して返す
+
+        COUNT(...) FILTER (WHERE ...) による条件付き集計で、1回のクエリで
+        完了数・未完了数を取得する（2つの数字が食い違うことがない）。
+        user を指定するとそのユーザーのタスクだけを集計する。
+        """
+        todos, counts = cls._completion_counts(user)
+        return cls._build_completion_stats(**todos.aggregate(**counts))
+
+    @classmethod
+    async def aget_completion_stats(cls, user=None):
+        """get_completion_stats() の非同期版"""
+        todos, counts = cls._completion_counts(user)
+        return cls._build_completion_stats(**await todos.aaggregate(**counts))
+
+    @classmethod
+    def get_data_fingerprint(cls, user=None):
+        """
+        タスクの (最新の updated, 件数) を返す
+
+        作成・更新・削除のどれが起きても値が変わるため、
+        集計結果やグラフのキャッシュキー・ETag に使う。
+        """
+        todos = cls.objects.all()
+        if user is not None:
+            todos = todos.filter(user=user)
+        result = todos.aggregate(latest=models.Max("updated"), count=models.Count("pk"))
+        return result["latest"], result["count"]
+
+    @classmethod
+    def get_daily_creation_counts(cls, user=None, days=7):
+        """
+        日ごとのタスク作成数を、タスクが作成された直近 days 日分だけ返す
+
+        GROUP BY と LIMIT をDB側で行うため、Todoの行そのものは読み込まない。
+        戻り値は日付の昇順の [(date, count), ...]。
+        """
+        todos = cls.objects.all()
+        if user is not None:
+            todos = todos.filter(user=user)
+        recent = (
+            todos.annotate(day=TruncDate("created"))
+            .values("day")
+            .annotate(count=models.Count("pk"))
+            .order_by("-day")
+            .values_list("day", "count")[:days]
+        )
+        return list(reversed(recent))
+
     @classmethod
     def get_todos_dataframe(cls):
         """ToDoデータをpandasのdataframeに変換する"""
+        # pandas は重いので、使うときに初めて読み込む
+        from django_pandas.io import read_frame
 
         # 全てのタスクを取得する(QuerySet)
         todos = cls.objects.all()
@@ -0,0 +1,150 @@
+"""
+タスク分析グラフの描画（スレッドセーフ・プロセスプール）
+
+- pyplot のグローバル状態（plt.subplots / plt.xticks / plt.savefig）を使わず、
+  リクエストごとに Figure + FigureCanvasAgg を生成するため、スレッド間で
+  図が混ざったり、閉じ忘れた図がリークしたりしない。
+- 描画は CPU を使い GIL を握るため、上限付きの ProcessPoolExecutor で行う。
+  ワーカーは max_tasks_per_child 回ごとに作り直し、メモリを一定に保つ。
+  （spawn で起動するので、このモジュールは Django に依存させない）
+- 待機+実行中の件数が max_pending を超えたら RenderPoolBusy を送出する。
+- 待ち行列の深さと描画時間を metrics() で参照できる。
+- matplotlib は最初の描画時に読み込む（URL 読み込み時に import しない）。
+  起動時間とワーカーのメモリを、分析ページを使わないプロセスで払わないため。
+"""
+
+import io
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence, Tuple
+
+# 分析ページ（グラフ描画・DataFrame 変換）でしか使わないため、起動時に読み込んではいけない
+# モジュール。起動時の import を確かめるテストとベンチマーク（bench_import_time）が共有する
+LAZY_MODULES = ("matplotlib", "pandas", "numpy", "django_pandas")
+
+
+def render_analytics_chart(stats, daily_counts) -> bytes:
+    """完了率の円グラフと日別作成数の棒グラフを描画してPNGのバイト列を返す"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    # グラフの枠組みを生成(1,2行、サイズは横12✖︎縦5インチ)
+    fig = Figure(figsize=(12, 5))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(1, 2)
+    # ------- 左側、円グラフの作成 --------
+    # グラフのラベル設定
+    labels = ["Completed", "Incomplete"]
+    # グラフの値(完了タスク数と未完了タスク数)
+    sizes = [stats["completed"], stats["not_completed"]]
+    # グラフの色設定(完了は緑、未完了はピンク)
+    colors = ["#66FF99", "#FF3399"]
+    # 円グラフを描写
+    ax1.pie(sizes, labels=labels, colors=colors, autopct="%1.1f%%", startangle=90)
+    # 円グラフを真円に保つ設定
+    ax1.axis("equal")
+    # グラフのタイトル設定
+    ax1.set_title("Completion Rate")
+
+    # ------- 右側、棒グラフの作成 --------
+    # データが存在する場合のみグラフ作成
+    if daily_counts:
+        days, counts = zip(*daily_counts)
+
+        # Y軸の最大値を5に設定
+        ax2.set_ylim(0, 5)
+
+        # 棒グラフを描写
+        ax2.bar([day.isoformat() for day in days], counts, color="#4e73df")
+
+        # X軸のラベルを回転させて重なりを防ぐ
+        ax2.tick_params(axis="x", labelrotation=20)
+
+        # タイトルと軸ラベルを英語で設定
+        ax2.set_title("Recent Task Creation")
+        ax2.set_xlabel("Date")
+        ax2.set_ylabel("Number of Tasks")
+
+    # ---------- グラフをイメージデータに変換 ----------
+    # グラフのレイアウトを調整（グラフ同士が重ならないように）
+    fig.tight_layout()
+    # グラフをPNG形式でメモリ上のバッファに保存
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def _timed_render(stats, daily_counts) -> Tuple[bytes, float]:
+    """ワーカープロセス側で実行される。PNG と描画にかかった秒数を返す"""
+    started = time.perf_counter()
+    png = render_analytics_chart(stats, daily_counts)
+    return png, time.perf_counter() - started
+
+
+class RenderPoolBusy(Exception):
+    """Raised when too many charts are already queued or rendering."""
+
+
+class ChartRenderPool:
+    def __init__(self, max_workers: int, max_pending: int, max_tasks_per_child: int = 100):
+        # max_workers=0 のときはプールを使わず、呼び出したスレッドで描画する
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queue_depth = 0
+        self.renders = 0
+        self.rejected = 0
+        self.render_seconds_total = 0.0
+        self.render_seconds_max = 0.0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, max_tasks_per_child=self.max_tasks_per_child
+                )
+            return self._executor
+
+    def render(self, stats, daily_counts: Sequence) -> bytes:
+        with self._lock:
+            if self.queue_depth >= self.max_pending:
+                self.rejected += 1
+                raise RenderPoolBusy
+            self.queue_depth += 1
+        try:
+            if self.max_workers:
+                png, seconds = self.executor.submit(_timed_render, stats, daily_counts).result()
+            else:
+                png, seconds = _timed_render(stats, daily_counts)
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+
+        with self._lock:
+            self.renders += 1
+            self.render_seconds_total += seconds
+            self.render_seconds_max = max(self.render_seconds_max, seconds)
+        return png
+
+    def metrics(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "queue_depth": self.queue_depth,
+                "renders": self.renders,
+                "rejected": self.rejected,
+                "render_seconds_total": round(self.render_seconds_total, 6),
+                "render_seconds_max": round(self.render_seconds_max, 6),
+                "render_seconds_avg": (
+                    round(self.render_seconds_total / self.renders, 6) if self.renders else 0.0
+                ),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
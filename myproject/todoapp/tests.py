@@ -1,7 +1,17 @@
+from datetime import date, datetime, timedelta
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
+
+from myproject.query_budget import assert_query_budget
 
+from .charts import ChartCache, chart_cache, render_pool
 from .models import Todo
+from .rendering import ChartRenderPool, render_analytics_chart
 
 
 class TodoModelTests(TestCase):
@@ -27,6 +37,215 @@ class TodoModelTests(TestCase):
         self.assertEqual(actual_todo.title, "テストタスク")
 
 
+class TodoCompletionStatsTests(TestCase):
+    def setUp(self):
+        self.alice = User.objects.create_user(username="alice", password="pass")
+        self.bob = User.objects.create_user(username="bob", password="pass")
+        Todo.objects.create(user=self.alice, title="A1", completed=True)
+        Todo.objects.create(user=self.alice, title="A2", completed=False)
+        Todo.objects.create(user=self.alice, title="A3", completed=False)
+        Todo.objects.create(user=self.bob, title="B1", completed=True)
+
+    def test_stats_use_single_query(self):
+        """完了・未完了の集計が1回のクエリで行われる"""
+        with self.assertNumQueries(1):
+            stats = Todo.get_completion_stats()
+        self.assertEqual(
+            stats, {"completed": 2, "not_completed": 2, "total": 4, "completion_rate": 50.0}
+        )
+
+    def test_stats_filtered_by_user(self):
+        stats = Todo.get_completion_stats(user=self.alice)
+        self.assertEqual(stats["completed"], 1)
+        self.assertEqual(stats["not_completed"], 2)
+        self.assertEqual(stats["completion_rate"], 33.33)
+
+    def test_stats_empty(self):
+        stats = Todo.get_completion_stats(user=User.objects.create_user(username="carol"))
+        self.assertEqual(stats["total"], 0)
+        self.assertEqual(stats["completion_rate"], 0)
+
+    def test_async_stats_match_sync(self):
+        stats = async_to_sync(Todo.aget_completion_stats)(user=self.bob)
+        self.assertEqual(stats, Todo.get_completion_stats(user=self.bob))
+
+
+class TodoDailyCreationCountsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="alice", password="pass")
+        other = User.objects.create_user(username="bob", password="pass")
+        # 10日分: i日目に i+1 件ずつ作成（created は auto_now_add なので後から書き換える）
+        for i in range(10):
+            created = timezone.make_aware(datetime(2026, 1, 1 + i, 12, 0))
+            for _ in range(i + 1):
+                todo = Todo.objects.create(user=self.user, title=f"T{i}")
+                Todo.objects.filter(pk=todo.pk).update(created=created)
+        Todo.objects.create(user=other, title="other")
+
+    def test_recent_days_in_one_query(self):
+        with self.assertNumQueries(1):
+            counts = Todo.get_daily_creation_counts(user=self.user, days=3)
+        self.assertEqual(
+            counts, [(date(2026, 1, 8), 8), (date(2026, 1, 9), 9), (date(2026, 1, 10), 10)]
+        )
+
+    def test_scoped_to_user(self):
+        counts = Todo.get_daily_creation_counts(user=self.user, days=30)
+        self.assertEqual(len(counts), 10)
+        self.assertEqual(sum(count for _, count in counts), 55)
+        self.assertEqual(counts[0][0] + timedelta(days=9), counts[-1][0])
+
+
+class TodoAnalyticsViewTests(TestCase):
+    def test_analytics_page_renders_for_logged_in_user(self):
+        user = User.objects.create_user(username="alice", password="pass")
+        Todo.objects.create(user=user, title="T1", completed=True)
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("todo_analytics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["stats"]["total"], 1)
+
+    def test_analytics_requires_login(self):
+        response = self.client.get(reverse("todo_analytics"))
+        self.assertEqual(response.status_code, 302)
+
+
+class TodoListQueryBudgetTests(TestCase):
+    def test_list_within_query_budget(self):
+        user = User.objects.create_user(username="alice", password="pass")
+        for i in range(5):
+            Todo.objects.create(user=user, title=f"T{i}")
+        self.client.force_login(user)
+
+        budget = settings.QUERY_BUDGET["ROUTES"]["todo_list"]
+        with assert_query_budget(budget, max_duplicates=0):
+            response = self.client.get(reverse("todo_list"))
+        self.assertEqual(response.status_code, 200)
+
+
+class TodoDeleteViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="alice", password="pass")
+        self.todo = Todo.objects.create(user=self.user, title="T1")
+        self.client.force_login(self.user)
+
+    def test_delete_in_one_query(self):
+        url = reverse("todo_delete", args=[self.todo.pk])
+        # セッション 1 + ユーザー 1 + DELETE 1
+        with assert_query_budget(3):
+            response = self.client.post(url)
+        self.assertRedirects(response, reverse("todo_list"), fetch_redirect_response=False)
+        self.assertFalse(Todo.objects.filter(pk=self.todo.pk).exists())
+
+    def test_cannot_delete_other_users_todo(self):
+        other = User.objects.create_user(username="bob", password="pass")
+        self.client.force_login(other)
+
+        response = self.client.post(reverse("todo_delete", args=[self.todo.pk]))
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(Todo.objects.filter(pk=self.todo.pk).exists())
+
+
+class TodoAnalyticsChartTests(TestCase):
+    def setUp(self):
+        chart_cache.clear()
+        self.user = User.objects.create_user(username="alice", password="pass")
+        self.todo = Todo.objects.create(user=self.user, title="T1")
+        self.client.force_login(self.user)
+        self.url = reverse("todo_analytics_chart")
+
+    def test_chart_is_png_with_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertTrue(response.content.startswith(b"\x89PNG"))
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(len(chart_cache), 1)
+
+    def test_matching_etag_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(3):  # セッション + ユーザー + 指紋のみ。集計も描画もしない
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_when_data_changes(self):
+        etag = self.client.get(self.url)["ETag"]
+        Todo.objects.create(user=self.user, title="T2")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(chart_cache), 2)
+
+
+class ChartCacheTests(TestCase):
+    def test_evicts_least_recently_used_by_size(self):
+        cache = ChartCache(max_bytes=10)
+        cache.set("a", b"1234")
+        cache.set("b", b"1234")
+        cache.get("a")
+        cache.set("c", b"1234")
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.size, 8)
+
+    def test_skips_entries_larger_than_limit(self):
+        cache = ChartCache(max_bytes=3)
+        cache.set("a", b"1234")
+        self.assertEqual(len(cache), 0)
+
+
+class ChartRenderingTests(TestCase):
+    stats = {"completed": 1, "not_completed": 2}
+    daily_counts = [(date(2026, 1, 1), 1), (date(2026, 1, 2), 3)]
+
+    def test_render_without_pyplot_state(self):
+        import matplotlib.pyplot as plt
+
+        png = render_analytics_chart(self.stats, self.daily_counts)
+        self.assertTrue(png.startswith(b"\x89PNG"))
+        # pyplot の図を作らないので、開いたままの図が残らない
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_process_pool_records_metrics(self):
+        pool = ChartRenderPool(max_workers=1, max_pending=2)
+        self.addCleanup(pool.shutdown)
+
+        png = pool.render(self.stats, self.daily_counts)
+        self.assertTrue(png.startswith(b"\x89PNG"))
+        metrics = pool.metrics()
+        self.assertEqual(metrics["renders"], 1)
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertGreater(metrics["render_seconds_total"], 0)
+
+    def test_busy_pool_returns_503(self):
+        user = User.objects.create_user(username="alice", password="pass")
+        self.client.force_login(user)
+        chart_cache.clear()
+        # 待ち行列が満杯の状態を再現する
+        render_pool.queue_depth = render_pool.max_pending
+        self.addCleanup(setattr, render_pool, "queue_depth", 0)
+
+        response = self.client.get(reverse("todo_analytics_chart"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_metrics_view_is_staff_only(self):
+        user = User.objects.create_user(username="alice", password="pass")
+        self.client.force_login(user)
+        response = self.client.get(reverse("todo_analytics_chart_metrics"))
+        self.assertEqual(response.status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        response = self.client.get(reverse("todo_analytics_chart_metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("queue_depth", response.json())
+
+
 class LoginAccessTests(TestCase):
     def test_create_todo_requires_login(self):
         """ログインしていないユーザーは新規作成ページに入れないはず"""
@@ -15,4 +15,12 @@ urlpatterns = [
     path("<int:pk>/delete/", views.TodoDeleteView.as_view(), name="todo_delete"),
     path("signup/", views.SignUpView.as_view(), name="signup"),
     path("analytics/", views.TodoAnalyticsView.as_view(), name="todo_analytics"),
+    path(
+        "analytics/chart.png", views.TodoAnalyticsChartView.as_view(), name="todo_analytics_chart"
+    ),
+    path(
+        "analytics/chart-metrics/",
+        views.TodoChartMetricsView.as_view(),
+        name="todo_analytics_chart_metrics",
+    ),
 ]
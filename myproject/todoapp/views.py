@@ -1,21 +1,23 @@
-import base64
-import io
-
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from django.contrib import messages
 from django.contrib.auth.forms import UserCreationForm
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.shortcuts import render
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import redirect, render
 from django.urls import reverse_lazy
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
 from django.utils.timezone import localtime
 from django.views import View, generic
+from django.views.decorators.http import condition
 from django.views.generic import CreateView, DeleteView, DetailView, ListView, UpdateView
 
+from myproject.response_cache import bump_version, cache_view
+
 from . import models
+from .charts import chart_cache, get_analytics_chart, render_pool
 from .forms import TodoForm
+from .rendering import RenderPoolBusy
 
 
 # ==========================================
@@ -72,6 +74,15 @@ class TodoDeleteView(TodoBaseView, DeleteView):
     template_name = "todoapp/todo_confirm_delete.html"
     success_message = "ToDoが削除されました"
 
+    def post(self, request, *args, **kwargs):
+        # 対象を読み込まず、ログインユーザーの ToDo を DELETE 1回で削除する（0件なら404）
+        deleted, _ = self.get_queryset().filter(pk=kwargs["pk"]).delete()
+        if not deleted:
+            raise Http404
+        bump_version("todos")
+        messages.success(request, self.success_message)
+        return redirect(self.success_url)
+
 
 class SignUpView(generic.CreateView):
     form_class = UserCreationForm
@@ -79,80 +90,77 @@ class SignUpView(generic.CreateView):
     template_name = "todoapp/signup.html"
 
 
-class TodoAnalyticsView(View):
+# 集計結果のページはユーザーごとにキャッシュし、Todo の変更で破棄する（todoapp.signals）
+@method_decorator(cache_view("todos"), "get")
+class TodoAnalyticsView(LoginRequiredMixin, View):
     template_name = "todoapp/todo_analytics.html"
 
     # GETリクエスト(ページの表示が来たときに実行されるメソッド)
     def get(self, request, *args, **kwargs):
-        # todoモデルから完了、未完了の統計データを取得
-        stats = models.Todo.get_completion_stats()
-        # グラフの枠組みを生成(1,2行、サイズは横12✖︎縦5インチ)
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        # ------- 左側、円グラフの作成 --------
-        # グラフのラベル設定
-        labels = ["Completed", "Incomplete"]
-        # グラフの値(完了タスク数と未完了タスク数)
-        sizes = [stats["completed"], stats["not_completed"]]
-        # グラフの色設定(完了は緑、未完了はピンク)
-        colors = ["#66FF99", "#FF3399"]
-        # 円グラフを描写
-        ax1.pie(sizes, labels=labels, colors=colors, autopct="%1.1f%%", startangle=90)
-        # 円グラフを真円に保つ設定
-        ax1.axis("equal")
-        # グラフのタイトル設定
-        ax1.set_title("Completion Rate")
-
-        # ------- 右側、棒グラフの作成 --------
-        # Todo モデルからデータをDataFrame形式で取得
-        df = models.Todo.get_todos_dataframe()
-        # データが存在する場合のみグラフ作成
-        if not df.empty:
-            # 日付
-            df["created_date"] = df["created"].dt.date
-            # 作成びごとにタスク数をカウント
-            daily_counts = df.groupby("created_date").size()
-
-            # 最新の7件のみ取得
-            recent_counts = daily_counts.tail(7)
-
-            # Y軸の最大値を5に設定
-            ax2.set_ylim(0, 5)
-
-            # 棒グラフを描写
-            recent_counts.plot(kind="bar", ax=ax2, color="#4e73df")
-
-            # X軸のラベルを回転させて重なりを防ぐ
-            plt.xticks(rotation=20)
-
-            # タイトルと軸ラベルを英語で設定
-            ax2.set_title("Recent Task Creation")
-            ax2.set_xlabel("Date")
-            ax2.set_ylabel("Number of Tasks")
-
-        # ---------- ③ グラフをイメージデータに変換 ----------
-        # メモリ上に一時的なバッファを作成
-        buffer = io.BytesIO()
-        # グラフのレイアウトを調整（グラフ同士が重ならないように）
-        plt.tight_layout()
-        # グラフをPNG形式で一時バッファに保存
-        plt.savefig(buffer, format="png")
-        # バッファの読み取り位置を先頭に戻す
-        buffer.seek(0)
-        # バッファからイメージデータを取得
-        image_png = buffer.getvalue()
-        # バッファを閉じる
-        buffer.close()
-
-        # イメージデータをBase64形式（テキスト形式）に変換
-        # これによりHTMLに直接埋め込めるようになる
-        graph = base64.b64encode(image_png).decode("utf-8")
-
-        # ---------- ④ テンプレートにデータを渡す ----------
+        # todoモデルから完了、未完了の統計データを取得（ログインユーザーのタスクのみ）
+        stats = models.Todo.get_completion_stats(user=request.user)
 
+        # グラフは別のURL(todo_analytics_chart)から画像として読み込む
         # テンプレートに渡すデータを辞書で準備
         context = {
             "stats": stats,
-            "graph": graph,
         }
         # テンプレートをレンダリングしてHTMLを生成し、レスポンスとして返す
         return render(request, self.template_name, context)
+
+
+# ==========================================
+# 分析グラフ(PNG)：ETag / Last-Modified による条件付きGET
+# (method_decorator で get を包むので、ログイン確認の後に評価される)
+# ==========================================
+
+
+def _chart_fingerprint(request):
+    """リクエスト中に1回だけ指紋を取得する（etag と last_modified の両方で使うため）"""
+    if not hasattr(request, "_todo_chart_fingerprint"):
+        request._todo_chart_fingerprint = models.Todo.get_data_fingerprint(user=request.user)
+    return request._todo_chart_fingerprint
+
+
+def _chart_etag(request, *args, **kwargs):
+    latest, count = _chart_fingerprint(request)
+    timestamp = latest.timestamp() if latest else 0
+    return f"{request.user.pk}-{count}-{timestamp}"
+
+
+def _chart_last_modified(request, *args, **kwargs):
+    latest, _ = _chart_fingerprint(request)
+    return latest
+
+
+@method_decorator(condition(etag_func=_chart_etag, last_modified_func=_chart_last_modified), "get")
+class TodoAnalyticsChartView(LoginRequiredMixin, View):
+    def get(self, request, *args, **kwargs):
+        # If-None-Match / If-Modified-Since が一致すれば、ここに来る前に 304 が返る
+        try:
+            png = get_analytics_chart(request.user, _chart_fingerprint(request))
+        except RenderPoolBusy:
+            # 描画待ちが溢れている場合は待たせずに 503 を返す
+            response = HttpResponse(status=503)
+            response["Retry-After"] = "1"
+            return response
+        response = HttpResponse(png, content_type="image/png")
+        # ユーザーごとの画像なので共有キャッシュには置かせず、毎回 ETag で再検証させる
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class TodoChartMetricsView(UserPassesTestMixin, View):
+    """グラフ描画プールとキャッシュの状態（スタッフのみ）"""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(
+            {
+                **render_pool.metrics(),
+                "cache_entries": len(chart_cache),
+                "cache_bytes": chart_cache.size,
+            }
+        )